@@ -16,16 +16,23 @@
 
 
 import math
-import random
 import pygame
 from core.prefab import Prefab
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 
 class Bullet(Prefab):
     """ 
     Represents a single bullet. 
     """
 
+    # Killed bullets waiting to be fired again.
+    Pool = []
+
     def __init__(self, game, origin, target):
         """ 
         Constructor. 
@@ -38,19 +45,31 @@ class Bullet(Prefab):
 
         """
         super().__init__("attack_bullet", origin[0], origin[1])
+        self.reset(game, origin, target)
+
+    def reset(self, game, origin, target):
+        """
+        Fires the bullet, whether new or reused from the pool.
+
+        Args:
+            game (Game): The game instance.
+            origin (int, int): The initial bullet position.
+            target (int, int): The position to aim at.
+
+        """
         self.game = game
 
         dx = target[0] - origin[0]
         dy = target[1] - origin[1]
 
         magnitude = math.sqrt(dx ** 2 + dy ** 2)
-        self.xSpeed = (dx / magnitude) * self.speed * random.randint(200, 500)
-        self.ySpeed = (dy / magnitude) * self.speed * random.randint(200, 500)
+        self.xSpeed = (dx / magnitude) * self.speed * self.game.random.randint(200, 500)
+        self.ySpeed = (dy / magnitude) * self.speed * self.game.random.randint(200, 500)
         self.life = magnitude / math.sqrt(self.xSpeed ** 2 + self.ySpeed ** 2)
         self.current_life = 0
 
         angle = math.degrees(math.atan2(-dy, dx))
-        self.image = pygame.transform.rotate(self.image, angle)
+        self.image = self.get_rotated_image(angle)
         self.rect = self.image.get_rect()
         self.rect.center = origin
 
@@ -75,12 +94,213 @@ class Bullet(Prefab):
             self.kill()
 
         # Collisions with enemies
-        for enemy in self.game.wave.enemies:
-            dx = enemy.rect.centerx - self.rect.centerx
-            dy = enemy.rect.centery - self.rect.centery
-            sqrMagnitude = (dx ** 2) + (dy ** 2)
-
-            if sqrMagnitude < (enemy.rect.width / 2) ** 2:
-                enemy.take_damage(self.damage)
-                self.kill()
-                return
+        for enemy in self.game.wave.get_grid().query_point(self.rect.center):
+            enemy.take_damage(self.damage)
+            self.kill()
+            return
+
+
+class BulletGroup(pygame.sprite.Group):
+    """
+    A sprite group that moves all of its bullets together, using numpy arrays.
+
+    Follows Bullet.update() for every bullet at once. Movement, lifetimes,
+    scene collisions and hits are worked out for all bullets together. Only
+    bullets that hit something, or die, run Python code. Hits are applied
+    in the order the bullets were fired, skipping enemies already killed.
+
+    With fewer than Threshold bullets, each bullet is updated on its own
+    instead, as setting up the arrays costs more than it saves.
+    """
+
+    # The number of bullets needed to move them together.
+    Threshold = 50
+
+    def __init__(self, game, capacity=64):
+        """
+        Constructor.
+
+        Args:
+            game (Game): The game instance.
+            capacity (int): The number of bullet slots to start with.
+
+        """
+        super().__init__()
+
+        self.game = game
+        self.slots = { }
+        self.bullets = [None] * capacity
+        self.free = []
+        self.count = 0
+        self.fired = 0
+
+        self.left = numpy.zeros(capacity)
+        self.top = numpy.zeros(capacity)
+        self.half_width = numpy.zeros(capacity)
+        self.half_height = numpy.zeros(capacity)
+        self.x_speed = numpy.zeros(capacity)
+        self.y_speed = numpy.zeros(capacity)
+        self.life = numpy.zeros(capacity)
+        self.current_life = numpy.zeros(capacity)
+        self.order = numpy.zeros(capacity, dtype=numpy.int64)
+        self.active = numpy.zeros(capacity, dtype=bool)
+
+    def grow(self):
+        """
+        Doubles the number of bullet slots.
+        """
+        capacity = len(self.bullets)
+        self.bullets.extend([None] * capacity)
+
+        for name in ["left", "top", "half_width", "half_height", "x_speed", "y_speed", "life", "current_life", "order", "active"]:
+            values = getattr(self, name)
+            setattr(self, name, numpy.concatenate((values, numpy.zeros(capacity, dtype=values.dtype))))
+
+    def add_internal(self, sprite, layer=None):
+        """
+        Adds a bullet to the group, giving it a slot in the arrays.
+
+        Args:
+            sprite (Bullet): The bullet being added.
+            layer: Unused, matches pygame.sprite.Group.
+
+        """
+        super().add_internal(sprite, layer)
+
+        if len(self.free) > 0:
+            slot = self.free.pop()
+        else:
+            if self.count == len(self.bullets):
+                self.grow()
+            slot = self.count
+            self.count += 1
+
+        self.slots[sprite] = slot
+        self.bullets[slot] = sprite
+        self.left[slot] = sprite.rect.x
+        self.top[slot] = sprite.rect.y
+        self.half_width[slot] = sprite.rect.width // 2
+        self.half_height[slot] = sprite.rect.height // 2
+        self.x_speed[slot] = sprite.xSpeed
+        self.y_speed[slot] = sprite.ySpeed
+        self.life[slot] = sprite.life
+        self.current_life[slot] = sprite.current_life
+        self.order[slot] = self.fired
+        self.active[slot] = True
+        self.fired += 1
+
+    def remove_internal(self, sprite):
+        """
+        Removes a bullet from the group, freeing its slot.
+
+        Args:
+            sprite (Bullet): The bullet being removed.
+
+        """
+        super().remove_internal(sprite)
+
+        slot = self.slots.pop(sprite)
+        self.bullets[slot] = None
+        self.active[slot] = False
+        self.free.append(slot)
+
+    def update(self, delta):
+        """
+        Moves every bullet once per frame, and resolves hits.
+
+        Args:
+            delta (float): The time (seconds) since the last update.
+
+        """
+        if len(self.slots) < BulletGroup.Threshold:
+            self.update_sprites(delta)
+            return
+
+        slots = numpy.flatnonzero(self.active[:self.count])
+
+        slots = slots[numpy.argsort(self.order[slots], kind="stable")]
+
+        # Move, with rects rounding half away from zero.
+        left = self.left[slots] + self.x_speed[slots] * delta
+        top = self.top[slots] + self.y_speed[slots] * delta
+        left = numpy.copysign(numpy.floor(numpy.abs(left) + 0.5), left)
+        top = numpy.copysign(numpy.floor(numpy.abs(top) + 0.5), top)
+        self.left[slots] = left
+        self.top[slots] = top
+
+        # Lifetime
+        current_life = self.current_life[slots] + delta
+        self.current_life[slots] = current_life
+        dead = self.life[slots] < current_life
+
+        # Collisions with scene
+        centre_x = (left + self.half_width[slots]).astype(int)
+        centre_y = (top + self.half_height[slots]).astype(int)
+        blocked = self.game.level.collision.points_blocked(centre_x, centre_y)
+        dead |= (current_life > 0.03) & blocked
+
+        # Collisions with enemies. Enemies are sorted by x, so each bullet only
+        # needs checking against the enemies close to it horizontally.
+        enemies = self.game.wave.enemies.sprites()
+        hit_bullets = hit_enemies = numpy.zeros(0, dtype=int)
+
+        if len(enemies) > 0:
+            enemy_x = numpy.array([enemy.rect.centerx for enemy in enemies])
+            enemy_y = numpy.array([enemy.rect.centery for enemy in enemies])
+            enemy_radius = numpy.array([enemy.rect.width / 2 for enemy in enemies])
+            max_radius = enemy_radius.max()
+
+            order = numpy.argsort(enemy_x, kind="stable")
+            sorted_x = enemy_x[order].astype(float)
+            first = numpy.searchsorted(sorted_x, centre_x - max_radius, "left")
+            last = numpy.searchsorted(sorted_x, centre_x + max_radius, "right")
+            counts = last - first
+
+            # Every (bullet, enemy) pair in range, with their squared distances.
+            hit_bullets = numpy.repeat(numpy.arange(len(slots)), counts)
+            offsets = numpy.arange(counts.sum()) - numpy.repeat(numpy.cumsum(counts) - counts, counts)
+            hit_enemies = order[numpy.repeat(first, counts) + offsets]
+
+            sqrMagnitude = (centre_x[hit_bullets] - enemy_x[hit_enemies]) ** 2 + (centre_y[hit_bullets] - enemy_y[hit_enemies]) ** 2
+            hit = sqrMagnitude < enemy_radius[hit_enemies] ** 2
+
+            hit_bullets = hit_bullets[hit]
+            hit_enemies = hit_enemies[hit]
+            ordered = numpy.lexsort((hit_enemies, hit_bullets))
+            hit_bullets = hit_bullets[ordered]
+            hit_enemies = hit_enemies[ordered]
+
+        # Copy the new positions to the sprites.
+        bullets = [self.bullets[slot] for slot in slots.tolist()]
+        for bullet, rect_x, rect_y, life in zip(bullets, left.astype(int).tolist(), top.astype(int).tolist(), current_life.tolist()):
+            bullet.rect.topleft = (rect_x, rect_y)
+            bullet.current_life = life
+
+        for i in numpy.flatnonzero(dead).tolist():
+            bullets[i].kill()
+
+        # Apply hits in firing order, each bullet hitting the first enemy
+        # spawned. Earlier hits may have killed an enemy.
+        resolved = -1
+        for i, j in zip(hit_bullets.tolist(), hit_enemies.tolist()):
+            if i != resolved and enemies[j].alive():
+                enemies[j].take_damage(bullets[i].damage)
+                bullets[i].kill()
+                resolved = i
+
+    def update_sprites(self, delta):
+        """
+        Moves each bullet on its own, in the order they were fired,
+        then copies the bullets that are left back to the arrays.
+
+        Args:
+            delta (float): The time (seconds) since the last update.
+
+        """
+        for bullet in sorted(self.slots, key=lambda bullet: self.order[self.slots[bullet]]):
+            bullet.update(delta)
+
+        for bullet, slot in self.slots.items():
+            self.left[slot] = bullet.rect.x
+            self.top[slot] = bullet.rect.y
+            self.current_life[slot] = bullet.current_life
@@ -17,11 +17,25 @@
 
 import pygame
 import random
+from contextlib import contextmanager
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 class Collision:
     """ 
     Handles collision detection on a grid of tiles.
     Used for turret placement, projectiles and navigation.
+
+    Blocked tiles are stored in a flat occupancy grid, one byte per tile
+    (1 if blocked). The grid covers the screen plus a one tile border, to
+    match the pathfinding grid. Points further off screen are never blocked.
+
+    Other objects can subscribe to be told which tiles changed, and the
+    version number goes up with every change, so cached results can tell
+    when they are out of date.
     """
 
     def __init__(self, level, resolution, tile_size):
@@ -38,8 +52,147 @@ class Collision:
         self.tile_size = tile_size
         self.width = resolution[0] // tile_size
         self.height = resolution[1] // tile_size
-        self.blocked_tiles = []
-        self.overlay = None
+        self.cols = self.width + 2
+        self.rows = self.height + 2
+        self.tiles = bytearray(self.cols * self.rows)
+        self.version = 0
+        self.subscribers = []
+
+        # Tiles changed during a batch { point: None }, see batch().
+        self.batch_depth = 0
+        self.changed = { }
+
+    def subscribe(self, callback):
+        """
+        Registers a function to be called when tiles change.
+
+        The function is given two lists of the top left points of changed
+        tiles: those that are now blocked, and those that are now clear.
+        Changes made in a batch are delivered together when it ends.
+
+        Args:
+            callback (function): The function to call.
+
+        """
+        self.subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        """
+        Stops a function being called when tiles change.
+
+        Args:
+            callback (function): A function passed to subscribe().
+
+        """
+        if callback in self.subscribers:
+            self.subscribers.remove(callback)
+
+    def snapshot(self):
+        """
+        Copies the blocked tiles into a detached collision grid.
+        The copy is not linked to a level, so it can be pickled and sent to other processes.
+
+        Returns:
+            (Collision): The copy.
+
+        """
+        collision = Collision(None, (self.width * self.tile_size, self.height * self.tile_size), self.tile_size)
+        collision.tiles[:] = self.tiles
+
+        return collision
+
+    def get_array(self, border=False):
+        """
+        Gets a view of the tiles for vectorised code, without copying them.
+        The view changes as tiles are blocked and unblocked.
+
+        Args:
+            border (bool): True to include the ring of tiles just off screen.
+
+        Returns:
+            (numpy.ndarray): A height x width array of uint8 (1 if blocked),
+            (height + 2) x (width + 2) with the border, or None if numpy is not installed.
+
+        """
+        if numpy is None:
+            return None
+
+        grid = numpy.frombuffer(self.tiles, dtype=numpy.uint8).reshape(self.rows, self.cols)
+        return grid if border else grid[1:-1, 1:-1]
+
+    def points_blocked(self, xs, ys):
+        """
+        Checks if each of the given points is blocked, as point_blocked() does.
+        Needs numpy.
+
+        Args:
+            xs (numpy.ndarray): The x coordinates, as integers.
+            ys (numpy.ndarray): The y coordinates, as integers.
+
+        Returns:
+            (numpy.ndarray): True for each point that is blocked.
+
+        """
+        tiles = self.get_array(True)
+        columns = xs // self.tile_size + 1
+        rows = ys // self.tile_size + 1
+        inside = (columns >= 0) & (columns < self.cols) & (rows >= 0) & (rows < self.rows)
+
+        blocked = numpy.zeros(len(xs), dtype=bool)
+        blocked[inside] = tiles[rows[inside], columns[inside]] != 0
+        return blocked
+
+    @contextmanager
+    def batch(self):
+        """
+        Groups tile changes, so subscribers are told about them all at once
+        when the batch ends, instead of after every tile. Batches can be nested.
+
+        Usage:
+            with collision.batch():
+                collision.block_point(x, y)
+                ...
+
+        """
+        self.batch_depth += 1
+
+        try:
+            yield
+        finally:
+            self.batch_depth -= 1
+
+            if self.batch_depth == 0:
+                self.notify()
+
+    def notify(self):
+        """
+        Tells subscribers about the tiles changed since the last notification.
+        """
+        if len(self.changed) == 0:
+            return
+
+        points = list(self.changed)
+        self.changed = { }
+        self.version += 1
+
+        # A tile may have changed back during a batch, so check where each ended up.
+        blocked = [point for point in points if self.point_blocked(*point)]
+        cleared = [point for point in points if not self.point_blocked(*point)]
+
+        for callback in list(self.subscribers):
+            callback(blocked, cleared)
+
+    def block_tiles(self, points):
+        """
+        Blocks the tiles containing the given points, as one batch.
+
+        Args:
+            points (list(int, int)): The points to block.
+
+        """
+        with self.batch():
+            for x, y in points:
+                self.block_point(x, y)
 
     def point_to_index(self, x, y):
         """
@@ -50,13 +203,16 @@ class Collision:
             y (int): The y coordinate.
 
         Returns:
-            (int): The index for the tile at (x, y).
+            (int): The index for the tile at (x, y), or -1 if it is outside the grid.
 
         """
-        xIndex = x // self.tile_size
-        yIndex = y // self.tile_size
+        xIndex = x // self.tile_size + 1
+        yIndex = y // self.tile_size + 1
+
+        if xIndex < 0 or yIndex < 0 or xIndex >= self.cols or yIndex >= self.rows:
+            return -1
 
-        return (yIndex * 1000) + xIndex
+        return yIndex * self.cols + xIndex
 
     def point_blocked(self, x, y):
         """
@@ -70,7 +226,9 @@ class Collision:
             True if blocked, otherwise False.
 
         """
-        return self.point_to_index(x, y) in self.blocked_tiles
+        index = self.point_to_index(x, y)
+
+        return index >= 0 and self.tiles[index] != 0
 
     def block_point(self, x, y):
         """
@@ -83,10 +241,12 @@ class Collision:
         """
         index = self.point_to_index(x, y)
 
-        if index not in self.blocked_tiles:
-            self.blocked_tiles.append(index)
-            self.overlay = None
-            self.level.pathfinding.repair((x - (x % self.tile_size), y - (y % self.tile_size)))
+        if index >= 0 and self.tiles[index] == 0:
+            self.tiles[index] = 1
+            self.changed[(x - (x % self.tile_size), y - (y % self.tile_size))] = None
+
+            if self.batch_depth == 0:
+                self.notify()
 
     def unblock_point(self, x, y):
         """
@@ -99,9 +259,12 @@ class Collision:
         """
         index = self.point_to_index(x, y)
 
-        if index in self.blocked_tiles:
-            self.blocked_tiles.remove(index)
-            self.overlay = None
+        if index >= 0 and self.tiles[index] != 0:
+            self.tiles[index] = 0
+            self.changed[(x - (x % self.tile_size), y - (y % self.tile_size))] = None
+
+            if self.batch_depth == 0:
+                self.notify()
 
 
     def rect_blocked(self, x, y, width, height):
@@ -129,9 +292,9 @@ class Collision:
 
         return False
 
-    def block_rect(self, x, y, width, height):
+    def rect_points(self, x, y, width, height):
         """
-        Makes the given rect area blocked.
+        Finds the tiles that block_rect() would block for the given rect.
 
         Args:
             x (int): The top left x coordinate.
@@ -139,13 +302,28 @@ class Collision:
             width (int): The width of the rect.
             height (int): The height of the rect.
 
+        Returns:
+            (list(int, int)): The top left point of each tile.
+
         """
         xOffset = x % self.tile_size
         yOffset = y % self.tile_size
 
-        for xPos in range(x - xOffset, x + width - 2, self.tile_size):
-            for yPos in range(y - yOffset, y + height - 2, self.tile_size):
-                self.block_point(xPos, yPos)
+        return [(xPos, yPos) for xPos in range(x - xOffset, x + width - 2, self.tile_size)
+                for yPos in range(y - yOffset, y + height - 2, self.tile_size)]
+
+    def block_rect(self, x, y, width, height):
+        """
+        Makes the given rect area blocked.
+
+        Args:
+            x (int): The top left x coordinate.
+            y (int): The top left y coordinate.
+            width (int): The width of the rect.
+            height (int): The height of the rect.
+
+        """
+        self.block_tiles(self.rect_points(x, y, width, height))
 
     def unblock_rect(self, x, y, width, height):
         """
@@ -161,7 +339,8 @@ class Collision:
         xOffset = x % self.tile_size
         yOffset = y % self.tile_size
 
-        for xPos in range(x - xOffset, x + width, self.tile_size):
-            for yPos in range(y - yOffset, y + height, self.tile_size):
-                
-                self.unblock_point(xPos, yPos)
+        with self.batch():
+            for xPos in range(x - xOffset, x + width, self.tile_size):
+                for yPos in range(y - yOffset, y + height, self.tile_size):
+
+                    self.unblock_point(xPos, yPos)
@@ -77,13 +77,13 @@ class Defence(Prefab):
             
                 # Spawn the attack.
                 if self.attack == "bullet":
-                    self.game.bullets.add(Bullet(self.game, self.rect.center, target))
+                    self.game.bullets.add(Bullet.create(self.game, self.rect.center, target))
                 elif self.attack == "explosion":
-                    self.game.explosions.add(Explosion(self.game, target, self.explosion_radius, self.explosion_damage))
+                    self.game.explosions.add(Explosion.create(self.game, target, self.explosion_radius, self.explosion_damage))
 
                 # Create the flash (if specified).
                 if hasattr(self, "flash_offset"):
-                    self.game.explosions.add(DefenceFlash(self.rect.center, target, self.flash_offset))
+                    self.game.explosions.add(DefenceFlash.create(self.rect.center, target, self.flash_offset))
 
                 # Used for one-time defences e.g. mines.
                 if self.attack_rate <= 0:
@@ -113,6 +113,8 @@ class Defence(Prefab):
     def get_target(self):
         """
         Attempts to find a suitable target.
+        Keeps the current target while it is suitable, otherwise picks one
+        of the enemies in range using the defence's target_policy.
 
         Returns:
             (int, int) The position of the target, if found.
@@ -122,12 +124,38 @@ class Defence(Prefab):
         if self.target is not None and self.is_target_suitable(self.target):
             return self.target.rect.center
 
-        for t in self.game.wave.enemies:
-            if self.is_target_suitable(t):
-                self.target = t
-                return t.rect.center
+        target = self.choose_target(self.game.wave.get_grid().query_radius(self.rect.center, self.attack_range))
+        if target is None:
+            return None
 
-        return None
+        self.target = target
+        return target.rect.center
+
+    def choose_target(self, candidates):
+        """
+        Picks a target from the enemies in range.
+
+        Args:
+            candidates (list(Enemy)): The enemies in range, in the order they spawned.
+
+        Returns:
+            (Enemy) The chosen enemy, or None if there are no candidates.
+
+        """
+        if len(candidates) == 0:
+            return None
+
+        policy = getattr(self, "target_policy", "first")
+
+        if policy == "closest":
+            x, y = self.rect.center
+            return min(candidates, key=lambda enemy: (enemy.rect.centerx - x) ** 2 + (enemy.rect.centery - y) ** 2)
+        elif policy == "strongest":
+            return max(candidates, key=lambda enemy: enemy.health)
+        elif policy == "furthest":
+            return min(candidates, key=lambda enemy: enemy.get_remaining_distance())
+
+        return candidates[0]
 
     def is_target_suitable(self, target):
         """
@@ -140,7 +168,8 @@ class Defence(Prefab):
             True if the target can be hit, otherwise false.
 
         """
-        if target not in self.game.wave.enemies:
+        # Enemies leave the wave's group when killed, so this avoids searching it.
+        if not target.alive():
             return False
 
         a = target.rect.center
@@ -155,10 +184,26 @@ class DefenceFlash(Prefab):
     A flash effect displayed when some defences attack.
     """
 
+    # Finished flashes waiting to be shown again.
+    Pool = []
+
     def __init__(self, defence_position, target, offset):
         """
         Constructor.
         
+        Args:
+            defence_position (int, int): The centre of the defence.
+            target (int, int): The centre of the target.
+            offset (float): The distance from the defence_position to the flash.
+
+        """
+        super().__init__("defence_flash", 0, 0)
+        self.reset(defence_position, target, offset)
+
+    def reset(self, defence_position, target, offset):
+        """
+        Shows the flash, whether new or reused from the pool.
+
         Args:
             defence_position (int, int): The centre of the defence.
             target (int, int): The centre of the target.
@@ -171,7 +216,7 @@ class DefenceFlash(Prefab):
         dx *= (offset / magnitude)
         dy *= (offset / magnitude)
 
-        super().__init__("defence_flash", defence_position[0] + dx - 16, defence_position[1] + dy - 16)
+        self.place(defence_position[0] + dx - 16, defence_position[1] + dy - 16)
 
     def update(self, delta):
         """
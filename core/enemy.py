@@ -19,7 +19,6 @@ from pygame.sprite import Sprite
 from core.prefab import Prefab
 import pygame
 import math
-import random
 
 
 class Enemy(Prefab):
@@ -41,15 +40,24 @@ class Enemy(Prefab):
         super().__init__(name, x, y)
 
         self.game = game
-        self.path = game.level.pathfinding.get_path()
-        self.target = self.path.start
+        self.manager = None
+        self.slot = -1
+
+        if getattr(game, "navigation", "paths") == "flowfield":
+            self.path = None
+            self.flow = game.level.pathfinding.get_flow_field()
+            self.target = game.level.pathfinding.find_start()
+        else:
+            self.path = game.level.pathfinding.get_path()
+            self.target = self.path.start
+
         self.rect.topleft = self.target
         self.x = self.target[0]
         self.y = self.target[1]
-        self.speed += random.randint(-25, 25)
+        self.speed += self.game.random.randint(-25, 25)
 
         # Make the enemies tougher each round
-        self.speed += random.randint(0, self.game.wave.number * 2)
+        self.speed += self.game.random.randint(0, self.game.wave.number * 2)
         self.health = self.health ** (1 + (self.game.wave.number / 35))
 
     def update(self, delta):
@@ -97,22 +105,55 @@ class Enemy(Prefab):
 
         Either changes target or kills the enemy.
         """
-        if not self.path.done:
+        if self.path is None:
+            self.target = self.flow.next(self.target)
+        elif not self.path.done:
 
             # Check if the path was invalidated.
-            if self.target[0] < self.game.window.resolution[0] and self.path.points is not None and self.target in self.path.points:
+            if self.target[0] < self.game.window.resolution[0] and self.path.contains(self.target):
                 self.path, self.target = self.game.level.pathfinding.get_partial_path(self.target)
 
             return
+        else:
+            self.target = self.path.next(self.target)
 
-        self.target = self.path.next(self.target)
         if not self.target:
             self.game.level.lives -= 1
             if(self.game.level.lives == 0):
-                self.game.menu.show_lose_screen()
+                self.game.game_over()
                 
             self.kill()
 
+    def get_remaining_distance(self):
+        """
+        Estimates how far the enemy still has to travel to reach the goal.
+
+        Returns:
+            (float) The distance (pixels). Falls back to the distance from the
+            left edge when the route is not known yet.
+
+        """
+        tile_size = self.game.level.collision.tile_size
+        remaining = None
+
+        if self.path is None:
+            self.flow.refresh()
+            distance = self.flow.distance[self.flow.grid.to_index(self.target)]
+
+            # Straight moves cost 3 in the flow field.
+            if distance != float("inf"):
+                remaining = (distance / 3) * tile_size
+        elif self.path.done:
+            index = self.path.positions.get(self.target)
+
+            if index is not None:
+                remaining = (len(self.path.points) - 1 - index) * tile_size
+
+        if remaining is None:
+            return self.rect.x
+
+        return remaining + math.sqrt((self.target[0] - self.rect.x) ** 2 + (self.target[1] - self.rect.y) ** 2)
+
     def take_damage(self, damage):
         """ 
         Takes damage. The enemy will die if their health drops below 0.
@@ -132,6 +173,9 @@ class Enemy(Prefab):
         """
         super().kill()
 
+        if self.manager is not None:
+            self.manager.remove(self)
+
         self.game.wave.enemy_killed()  
         
         # True if the enemy died on the map
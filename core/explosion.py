@@ -20,6 +20,11 @@ import random
 import pygame
 from core.prefab import Prefab
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 
 class Explosion(Prefab):
     """
@@ -27,6 +32,9 @@ class Explosion(Prefab):
     Contains an animated graphic.
     """
 
+    # Finished explosions waiting to be set off again.
+    Pool = []
+
     def  __init__(self, game, position, radius, damage):
        """
        Constructor.
@@ -39,11 +47,41 @@ class Explosion(Prefab):
 
        """
        super().__init__("attack_explosion", position[0], position[1])
+       self.reset(game, position, radius, damage)
+
+    def reset(self, game, position, radius, damage):
+       """
+       Sets off the explosion, whether new or reused from the pool.
+
+       Args:
+            game (Game): The game instance.
+            position (int, int): The coordinates of the explosion.
+            radius (float): The damage radius of the explosion.
+            damage (float): The damage at the centre of the explosion.
+
+       """
+       self.place(position[0], position[1])
        self.rect.center = position
 
+       enemies = game.wave.get_grid().query_radius(self.rect.center, radius)
+       if len(enemies) == 0:
+            return
+
        max_magnitude = radius ** 2
 
-       for enemy in game.wave.enemies:
+       if numpy is not None:
+            # Work out the falloff for every enemy in range together.
+            dx = numpy.array([enemy.rect.centerx for enemy in enemies]) - self.rect.centerx
+            dy = numpy.array([enemy.rect.centery for enemy in enemies]) - self.rect.centery
+            magnitude = (dx ** 2) + (dy ** 2)
+            hit = numpy.flatnonzero(magnitude < max_magnitude)
+            falloff = damage * (1 - (magnitude[hit] / max_magnitude))
+
+            for i, amount in zip(hit.tolist(), falloff.tolist()):
+                enemies[i].take_damage(amount)
+            return
+
+       for enemy in enemies:
             dx = enemy.rect.centerx - self.rect.centerx
             dy = enemy.rect.centery - self.rect.centery
             magnitude = (dx ** 2) + (dy ** 2)
@@ -25,28 +25,59 @@ from core.enemy import Enemy
 from core.wave import Wave
 from core.menu import Menu
 from core.prefab import Prefab
+from core.bullet import BulletGroup
+from core.renderer import Renderer
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 
 class Game:
     """ 
     Contains the main control code and the game loop.
     """
-    def __init__(self, window):
+    def __init__(self, window, level="basic", **settings):
         """ 
         Constructor. 
         
         Args:
             window (Window): The window instance to render to.
+            level (str): The name of the first level to load.
+            **settings: Values to use instead of the default settings below.
         """
         self.show_path_debug = False
         self._logged_towers = None
 
+        #Choose default algorithm to run when playing
+        self.pathfinding_algo = "astar"  #possible values {greedy, astar, dijkstra, dstar_lite}
+        self.distance_metric = "manhattan"  #possible values {manhattan, euclidean, chebyshev}
+        self.navigation = "paths"  #possible values {paths, flowfield}, flowfield makes all enemies share one distance field
+        #We determined that these combinations of algo + distance measure are the best:
+        #{astar with manhattan, greedy with euclidean, dijkstra with euclidean} {and the overall BEST algo is astar with manhattan}
+        self.precompute_workers = 0  #number of processes that solve each level's starting paths while it loads, 0 searches them during play instead
+        self.path_cache = False  #possible values {True, False}, saves each level's starting paths in cache/ so later loads skip the search (and reuse the same starts)
+        self.enemy_simulation = "sprites"  #possible values {sprites, arrays}, arrays moves all enemies together with numpy (sprites is used if numpy is missing)
+        self.bullet_simulation = "sprites"  #possible values {sprites, arrays}, arrays moves bullets together with numpy once there are 50 or more (sprites is used if numpy is missing)
+        self.rendering = "dirty"  #possible values {dirty, full}, dirty only redraws the parts of the window that changed during play
+        self.bake_walls = True  #possible values {True, False}, draws placed walls into the level background once instead of every frame
+        self.seed = None  #seed for the game's random numbers, None picks a different seed each run
+        self.deterministic = False  #possible values {True, False}, True uses a fixed frame time and path search amount, so a seed and the same placements replay exactly
+
+        for name, value in settings.items():
+            setattr(self, name, value)
+
         self.window = window
         self.clock = pygame.time.Clock()
+        self.renderer = Renderer(window)
         self.defences = pygame.sprite.Group()
-        self.bullets = pygame.sprite.Group()
+        if self.bullet_simulation == "arrays" and numpy is not None:
+            self.bullets = BulletGroup(self)
+        else:
+            self.bullets = pygame.sprite.Group()
         self.explosions = pygame.sprite.Group()
-        self.load_level("basic")
+        self.load_level(level)
         self.defence_type = 0
         self.defence_prototypes = [
             Defence(self, "defence_" + name, -100, -100)
@@ -60,12 +91,6 @@ class Game:
         #with open("tower_log.csv", "w") as f:
         #    f.write("time,action,tile_x,tile_y\n")
 
-        #Choose default algorithm to run when playing
-        self.pathfinding_algo = "astar"  #possible values {greedy, astar, dijkstra}
-        self.distance_metric = "manhattan"  #possible values {manhattan, euclidean, chebyshev}
-        #We determined that these combinations of algo + distance measure are the best:
-        #{astar with manhattan, greedy with euclidean, dijkstra with euclidean} {and the overall BEST algo is astar with manhattan}
-
     def load_level(self, name):
         """
         Loads a new level.
@@ -77,9 +102,12 @@ class Game:
         self.defences.empty()
         self.bullets.empty()
         self.explosions.empty()
+        Prefab.clear_pools()
+        self.random = random.Random(self.seed)
         self.level = Level(self, name)
         self.wave = Wave(self, 1)
         self.menu = Menu(self)
+        self.renderer.set_background(self.level.background)
 
     def run(self):
         """ 
@@ -89,6 +117,8 @@ class Game:
 
         while self.running:
             delta = self.clock.tick(60) / 1000.0
+            if self.deterministic:
+                delta = 1 / 60.0
             
             # Look for a quit event
             for event in pygame.event.get():
@@ -111,40 +141,79 @@ class Game:
                     self.game_started = True
                     print("Game timer started!")
 
-            elapsed = time.time() - self._start_time
+            # Measured by the game's own clock, so replays follow the game's timing.
+            elapsed = self.level.time
             #self.replay_tower_placements(elapsed)
 
             # Call update functions
-            self.menu.update()
-            self.level.pathfinding.update()
+            self.update(delta)
 
-            if not self.menu.visible:
-                self.level.time += delta
-                self.defences.update(delta)
-                self.bullets.update(delta)
-                self.explosions.update(delta)
+            # Redraw graphics
+            self.draw()
 
-                self.wave.update(delta)
-                if self.wave.done:
-                    self.wave = Wave(self, self.wave.number + 1)
+    def update(self, delta):
+        """
+        Updates the menu and pathfinding, and the level unless the game is paused.
 
-            # Redraw graphics
-            self.window.clear()
-            self.level.prefabs.draw(self.window.screen)
-            self.defences.draw(self.window.screen)
-            self.bullets.draw(self.window.screen)
-            self.wave.enemies.draw(self.window.screen)
-            self.explosions.draw(self.window.screen)
-            self.menu.draw(self.window.screen)
-
-            # --- PATHFINDING DEBUG VISUALIZATION ---
-            if self.show_path_debug:
-                for path in self.level.pathfinding.pool:
-                    if hasattr(path, "draw_debug"):
-                        path.draw_debug()
-
-            # Menu and HUD last (on top)
-            self.menu.draw(self.window.screen)
+        Args:
+            delta (float): The time (seconds) since the last update.
+
+        """
+        self.menu.update()
+        self.update_level(delta)
+
+    def update_level(self, delta):
+        """
+        Updates pathfinding, and the level unless the game is paused.
+
+        Args:
+            delta (float): The time (seconds) since the last update.
+
+        """
+        self.level.pathfinding.update()
+
+        if not self.menu.visible:
+            self.level.time += delta
+            self.defences.update(delta)
+            self.bullets.update(delta)
+            self.explosions.update(delta)
+
+            self.wave.update(delta)
+            if self.wave.done:
+                self.wave = Wave(self, self.wave.number + 1)
+
+    def game_over(self):
+        """
+        Called when the last life is lost. Shows the lose screen.
+        """
+        Prefab.clear_pools()
+        self.menu.show_lose_screen()
+
+    def draw(self):
+        """
+        Redraws the window.
+        Only the parts that changed are redrawn during play, unless rendering is "full".
+        """
+        screen = self.window.screen
+        self.renderer.begin(self.rendering == "full" or self.menu.visible or self.show_path_debug)
+        self.renderer.draw(self.defences)
+        self.renderer.draw(self.bullets)
+        self.renderer.draw(self.wave.enemies)
+        self.renderer.draw(self.explosions)
+
+        # --- PATHFINDING DEBUG VISUALIZATION ---
+        if self.show_path_debug:
+            for path in self.level.pathfinding.pool:
+                if hasattr(path, "draw_debug"):
+                    path.draw_debug()
+
+        # Menu and HUD last (on top)
+        if self.menu.visible:
+            self.menu.draw(screen)
+        else:
+            self.renderer.draw(self.menu.components)
+
+        self.renderer.end()
 
     def quit(self):
         """
@@ -187,11 +256,11 @@ class Game:
         if self.level.collision.rect_blocked(x, y, defence.rect.width - 2, defence.rect.height - 2):
             return
 
-        # Stop if the defence may lead no path for enemies.
-        if hasattr(defence, "block") and self.level.pathfinding.is_critical((x, y)):
+        # Stop if the defence would leave no path for enemies.
+        if hasattr(defence, "block") and self.level.pathfinding.is_critical(self.level.collision.rect_points(x, y, defence.rect.width, defence.rect.height)):
             return
 
-        self.defences.add(Defence(self, defence.name, x, y))
+        self.add_defence(Defence(self, defence.name, x, y))
         self.level.money -= defence.cost
 
         # --- NEW LOGGING ---
@@ -199,10 +268,23 @@ class Game:
         tile_y = y // 32
         #self.log_tower_event(defence.name, tile_x, tile_y)
 
+    def add_defence(self, defence):
+        """
+        Adds a placed defence to the level.
+        Defences that never change, such as walls, are baked into the level background if bake_walls is set.
+
+        Args:
+            defence (Defence): The new defence.
+
+        """
+        if self.bake_walls and defence.attack == "none" and not defence.rotate:
+            self.level.bake(defence)
+        else:
+            self.defences.add(defence)
+
     def log_tower_event(self, action, tile_x, tile_y):
         """Logs tower placement/removal events with timestamp."""
-        import time
-        t = round(time.time() - self._start_time, 3)
+        t = round(self.level.time, 3)
         with open("tower_log.csv", "a") as f:
             f.write(f"{t},{action},{tile_x},{tile_y}\n")
     
@@ -242,6 +324,6 @@ class Game:
             if not tower["done"] and elapsed_time >= tower["time"]:
                 px = tower["x"] * 32
                 py = tower["y"] * 32
-                self.defences.add(Defence(self, tower["name"], px, py))
+                self.add_defence(Defence(self, tower["name"], px, py))
                 tower["done"] = True
                 print(f"[Replay] Replayed {tower['name']} at ({tower['x']}, {tower['y']})")
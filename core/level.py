@@ -15,6 +15,7 @@
 ###########################################
 
 
+import os
 from core.prefab import Prefab
 from core.collision import Collision
 from core.wave import Wave
@@ -56,7 +57,7 @@ class Level:
 
         """
         try:
-            with open("levels\\" + self.name + ".level", "r") as file:
+            with open(os.path.join("levels", self.name + ".level"), "r") as file:
                 self.data = [line.strip().split(" ") for line in file.readlines() if len(line.strip()) > 0 and line[0] != "#"]
 
         except IOError:
@@ -70,23 +71,47 @@ class Level:
         self.prefabs = OrderedUpdates()
         self.pathfinding = Pathfinding(self.game, self.collision)
 
-        for args in self.data:
-            name = args[0]
-            x = int(args[1])
-            y = int(args[2])
+        # Block all the level's tiles together, before any paths exist.
+        with self.collision.batch():
+            for args in self.data:
+                name = args[0]
+                x = int(args[1])
+                y = int(args[2])
 
-            prefab = Prefab(name, x, y)
-            self.prefabs.add(prefab)
+                prefab = Prefab(name, x, y)
+                self.prefabs.add(prefab)
 
-            if hasattr(prefab, "block"):
-                # Block textures are 1 pixel wider to make a full border
-                self.collision.block_rect(x, y, prefab.rect.width - 1, prefab.rect.height - 1)
+                if hasattr(prefab, "block"):
+                    # Block textures are 1 pixel wider to make a full border
+                    self.collision.block_rect(x, y, prefab.rect.width - 1, prefab.rect.height - 1)
 
-        self.pathfinding.precompute(30)
+        self.draw_background()
+        self.pathfinding.precompute(30, getattr(self.game, "precompute_workers", 0))
         self.wave = Wave(self.game, 1)
         self.lives = 20
         self.money = 600
         self.time = 0
 
+    def draw_background(self):
+        """
+        Draws the level's prefabs into a single background surface.
+        They never move, so this only needs doing when the level starts.
+        """
+        self.background = self.game.window.background.copy()
+        self.prefabs.draw(self.background)
+
+    def bake(self, prefab):
+        """
+        Adds a prefab that will never move or change to the level, drawing
+        it into the background instead of every frame.
+
+        Args:
+            prefab (Prefab): The prefab to add.
+
+        """
+        self.prefabs.add(prefab)
+        self.background.blit(prefab.image, prefab.rect)
+        self.game.renderer.invalidate(prefab.rect)
+
     def get_score(self):
         return int((self.time / 5) ** 1.4 + (self.game.wave.number - 1) ** 3)
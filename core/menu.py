@@ -18,6 +18,7 @@
 from core.prefab import Prefab
 from core.leaderboard import Leaderboard
 from pygame.sprite import OrderedUpdates
+from collections import OrderedDict
 import pygame
 import math
 
@@ -273,6 +274,11 @@ class MenuLabel(Prefab):
     A label displayed by the menu system. Contains a background.
     """
 
+    # Used to cache rendered labels { (background, font, text, colour), image },
+    # dropping the least recently used once there are more than TextCacheSize.
+    TextCache = OrderedDict()
+    TextCacheSize = 256
+
     def __init__(self, menu, type, text, x, y):
         """
         Constructor.
@@ -337,8 +343,20 @@ class MenuLabel(Prefab):
         self.image_template = image
 
         if hasattr(self, "font"):
-            self.image = image.copy()
-            self.render_text(self.image)
+            key = (image, self.font, self.text, (self.col_r, self.col_g, self.col_b))
+            cached = MenuLabel.TextCache.get(key)
+
+            if cached is None:
+                cached = image.copy()
+                self.render_text(cached)
+
+                MenuLabel.TextCache[key] = cached
+                if len(MenuLabel.TextCache) > MenuLabel.TextCacheSize:
+                    MenuLabel.TextCache.popitem(last=False)
+            else:
+                MenuLabel.TextCache.move_to_end(key)
+
+            self.image = cached
         else:
             self.image = image
            
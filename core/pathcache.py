@@ -0,0 +1,138 @@
+
+
+###########################################
+#
+# COMP 1551
+# Core Programming
+#
+# Coursework 2 - Mini Project
+#
+# George Loines
+# 200836065
+#
+# 02 Feb 2015
+#
+###########################################
+
+
+import hashlib
+import os
+import struct
+
+
+class PathCache:
+    """
+    Stores the finished starting paths of a level on disk, so that loading
+    the level again can fill the path pool without searching.
+
+    Each layout is saved to its own file, named by a hash of the blocked
+    tiles, tile size, pathfinding algorithm, distance metric and random
+    seed. Changing any of these uses a different file.
+
+    File format (little endian):
+        header: "PATH", version (uint16), path count (uint16)
+        each path: start x, start y (int16), nodes expanded (uint32),
+                   point count (uint16), then x, y (int16) for each point
+    """
+    Directory = "cache"
+    Version = 2
+
+    def __init__(self, pathfinding):
+        """
+        Constructor.
+
+        Args:
+            pathfinding (Pathfinding): The pathfinding manager instance.
+
+        """
+        self.pathfinding = pathfinding
+        self.key = self.get_key()
+        self.file = os.path.join(PathCache.Directory, self.key + ".paths")
+
+    def get_key(self):
+        """
+        Works out the cache key for the current state of the level.
+
+        Returns:
+            (str): The key, as a hex string.
+
+        """
+        collision = self.pathfinding.collision
+        game = self.pathfinding.game
+        data = "{}|{}|{}|{}|{}|{}|".format(
+            PathCache.Version,
+            game.window.resolution,
+            collision.tile_size,
+            getattr(game, "pathfinding_algo", "astar"),
+            getattr(game, "distance_metric", "manhattan"),
+            getattr(game, "seed", None)
+        )
+
+        return hashlib.sha1(data.encode("ascii") + bytes(collision.tiles)).hexdigest()
+
+    def load(self, count):
+        """
+        Loads the saved paths, if there are any.
+
+        Args:
+            count (int): The number of paths needed.
+
+        Returns:
+            (list(((int, int), list(int, int), int))): The start, points and nodes
+            expanded for each path, or None if there are not enough saved paths.
+
+        """
+        if not os.path.isfile(self.file):
+            return None
+
+        try:
+            with open(self.file, "rb") as file:
+                data = file.read()
+
+            magic, version, total = struct.unpack_from("<4sHH", data, 0)
+            if magic != b"PATH" or version != PathCache.Version or total < count:
+                return None
+
+            offset = struct.calcsize("<4sHH")
+            paths = []
+
+            for i in range(count):
+                x, y, nodes, length = struct.unpack_from("<hhIH", data, offset)
+                offset += struct.calcsize("<hhIH")
+
+                values = struct.unpack_from("<%dh" % (length * 2), data, offset)
+                offset += length * 4
+
+                points = list(zip(values[0::2], values[1::2]))
+                paths.append(((x, y), points, nodes))
+
+            return paths
+
+        except (IOError, struct.error) as e:
+            print("Could not load path cache:", e)
+            return None
+
+    def save(self, paths):
+        """
+        Saves finished paths.
+
+        Args:
+            paths (list(Path)): The finished paths to save.
+
+        """
+        data = [struct.pack("<4sHH", b"PATH", PathCache.Version, len(paths))]
+
+        for path in paths:
+            data.append(struct.pack("<hhIH", path.start[0], path.start[1], path.nodes_used, len(path.points)))
+            data.append(struct.pack("<%dh" % (len(path.points) * 2), *[value for point in path.points for value in point]))
+
+        try:
+            os.makedirs(PathCache.Directory, exist_ok=True)
+
+            # Write to a temporary file first, so a half written file is never loaded.
+            with open(self.file + ".tmp", "wb") as file:
+                file.write(b"".join(data))
+            os.replace(self.file + ".tmp", self.file)
+
+        except (IOError, OSError) as e:
+            print("Could not save path cache:", e)
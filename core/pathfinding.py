@@ -16,9 +16,15 @@
 
 
 import random
+import time
+import heapq
+import itertools
+from array import array
+from concurrent.futures import ProcessPoolExecutor
 import pygame
 import csv
 import os
+from core.pathcache import PathCache
 
 class Pathfinding:
     """
@@ -28,6 +34,9 @@ class Pathfinding:
     selected for each enemy that is spawned. If a path becomes blocked,
     it will be repaired or recalculated. Enemies can switch between 
     paths to continue moving if their current path is being recalculated.
+
+    Alternatively, enemies can share a single flow field that gives the
+    next tile towards the finish from anywhere in the level.
     """
 
     def __init__(self, game, collision):
@@ -41,8 +50,26 @@ class Pathfinding:
         """
         
         self.game = game
+        self.random = getattr(game, "random", random)
         self.collision = collision
+        self.grid = SearchGrid(game.window.resolution, collision)
         self.pool = []
+        self.flow = None
+        self.cache = None
+        self.cache_version = 0
+
+        # Scheduling of path searches each frame (times in milliseconds).
+        self.slice = 25
+        self.min_budget = 1.0
+        self.max_budget = 8.0
+        self.frame_time = 1000 / 60
+        self.last_update_time = 0
+        self.iteration_time = 0.05
+        self.fixed_iterations = 500  # Iterations each frame in deterministic games, instead of a time budget.
+        self.turn = 0
+
+        # The finished paths using each tile { grid index: { path: None } }.
+        self.usage = { }
         self.partials = 0
         # Add after self.partials = 0
         self.metrics = {
@@ -50,22 +77,34 @@ class Pathfinding:
                 "paths_completed": 0,
                 "total_nodes_expanded": 0,
                 "total_path_length": 0,
-                "paths_attempted": 0
+                "paths_attempted": 0,
+                "paths_cached": 0
             },
             "greedy": {
                 "paths_completed": 0,
                 "total_nodes_expanded": 0,
                 "total_path_length": 0,
-                "paths_attempted": 0
+                "paths_attempted": 0,
+                "paths_cached": 0
             },
             "dijkstra": {
                 "paths_completed": 0,
                 "total_nodes_expanded": 0,
                 "total_path_length": 0,
-                "paths_attempted": 0
+                "paths_attempted": 0,
+                "paths_cached": 0
+            },
+            "dstar_lite": {
+                "paths_completed": 0,
+                "total_nodes_expanded": 0,
+                "total_path_length": 0,
+                "paths_attempted": 0,
+                "paths_cached": 0
             }
         }
 
+        collision.subscribe(self.tiles_changed)
+
     def log_metrics(self):
         """
         Logs current run metrics to a CSV file (tower_metrics.csv)
@@ -95,16 +134,118 @@ class Pathfinding:
                 metrics["paths_attempted"]
             ])
 
-    def precompute(self, count):
+    def precompute(self, count, workers=0):
         """
         Starts precomputing a given number of paths.
+        Does nothing if enemies follow the flow field, as they never use the paths.
 
         Args:
             count (int): The number of paths to precompute.
+            workers (int): The number of processes used to finish the paths
+                straight away. If 0, the paths are searched during the
+                following frames instead.
+
+        """
+        # With an empty pool, there are no paths to search or repair either.
+        if getattr(self.game, "navigation", "paths") == "flowfield":
+            return
+
+        # Loading saved paths would skip searches, so deterministic games always search.
+        if getattr(self.game, "path_cache", False) and not getattr(self.game, "deterministic", False):
+            self.cache = PathCache(self)
+            self.cache_version = self.collision.version
+            cached = self.cache.load(count)
+
+            if cached is not None:
+                for start, points, nodes in cached:
+                    path = Path(self, start)
+                    self.pool.append(path)
+                    path.nodes_expanded = nodes
+                    path.complete(points, True)
+
+                self.cache = None
+                return
+
+        starts = [self.find_start() for i in range(count)]
+        results = None
+
+        if workers > 0:
+            results = self.solve_parallel(starts, workers)
+
+        for i, start in enumerate(starts):
+            path = Path(self, start)
+            self.pool.append(path)
+
+            if results is not None and results[i][0] is not None:
+                path.nodes_expanded = results[i][1]
+                path.complete(results[i][0])
+
+        if self.cache is not None:
+            self.save_cache()
+
+    def save_cache(self):
+        """
+        Saves the starting paths to the path cache once they have all finished,
+        as long as the level's layout has not changed since they were started.
+        """
+        paths = self.pool[self.partials:]
+
+        if not all(path.done for path in paths):
+            return
+
+        if self.collision.version == self.cache_version:
+            self.cache.save(paths)
+
+        self.cache = None
+
+    def solve_parallel(self, starts, workers):
+        """
+        Solves paths across several processes, using a copy of the collision grid.
+        The starts are shared out in turn, and each process solves its share one
+        after another (see solve_paths).
+
+        Args:
+            starts (list(int, int)): The start of each path.
+            workers (int): The number of processes to use.
+
+        Returns:
+            (list): The points and nodes expanded for each start, in the same
+            order. Solved in this process instead if the processes fail, or None
+            if that fails too.
 
         """
-        for i in range(count):
-            self.pool.append(Path(self, self.find_start()))
+        workers = min(workers, len(starts))
+        if workers == 0:
+            return None
+
+        algo = getattr(self.game, "pathfinding_algo", "astar")
+        metric = getattr(self.game, "distance_metric", "manhattan")
+        collision = self.collision.snapshot()
+        resolution = self.game.window.resolution
+
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(solve_paths, collision, resolution, starts[i::workers], algo, metric)
+                    for i in range(workers)
+                ]
+                solved = [future.result() for future in futures]
+
+        except Exception as e:
+            print("Could not precompute paths in parallel:", e)
+
+            try:
+                solved = [solve_paths(collision, resolution, starts[i::workers], algo, metric) for i in range(workers)]
+            except Exception as e:
+                print("Could not precompute paths:", e)
+                return None
+
+        results = [None] * len(starts)
+        for i, chunk in enumerate(solved):
+            for j, result in enumerate(chunk):
+                results[i + j * workers] = result
+
+        return results
 
     def find_start(self):
         """
@@ -122,12 +263,12 @@ class Pathfinding:
         while attempts > 0:
             attempts -= 1
 
-            y = random.randint(0, cells - 1) * self.collision.tile_size
+            y = self.random.randint(0, cells - 1) * self.collision.tile_size
             if not self.collision.point_blocked(x - 32, y):
                 return (x, y)
 
         # No start found, supply a default.
-        return (x, random.randint(0, cells - 1) * self.collision.tile_size)
+        return (x, self.random.randint(0, cells - 1) * self.collision.tile_size)
 
     def get_point_usage(self, point):
         """
@@ -140,23 +281,155 @@ class Pathfinding:
             (int): The number of paths using the given point.
 
         """
-        total = 0
+        return len(self.usage.get(self.grid.to_index(point), ()))
 
-        for path in self.pool:
-            if path.done and point in path.points:
-                total += 1
+    def get_index_usage(self, index):
+        """
+        Returns the number of existing paths that use the given tile.
+
+        Args:
+            index (int): The grid index of the tile.
+
+        Returns:
+            (int): The number of paths using the tile.
+
+        """
+        return len(self.usage.get(index, ()))
+
+    def index_path(self, path):
+        """
+        Records the tiles used by a finished path, replacing any previous record.
+
+        Args:
+            path (Path): The finished path.
+
+        """
+        self.unindex_path(path)
+        path.indexed = [self.grid.to_index(point) for point in path.points]
+
+        for index in path.indexed:
+            self.usage.setdefault(index, { })[path] = None
 
-        return total
+    def unindex_path(self, path):
+        """
+        Removes the record of the tiles used by a path.
+
+        Args:
+            path (Path): The path, which is being repaired or recalculated.
+
+        """
+        if len(path.indexed) == 0:
+            return
+
+        for index in path.indexed:
+            self.usage[index].pop(path, None)
+
+        path.indexed = []
+
+    def is_full_path(self, path):
+        """
+        Returns True if the path starts from the right of the screen.
+        """
+        return path.start[0] >= self.game.window.resolution[0]
     
     def update(self):
         """
-        Continues generating paths.
+        Continues generating paths, until this frame's time budget is used up,
+        or for a fixed number of iterations in deterministic games.
         Run each frame.
+
+        Partial paths, requested by stuck enemies, are searched first. The
+        other unfinished paths then take turns, starting from a different path
+        each frame.
         """
-        for path in self.pool:
-            if not path.done:
-                path.search()
-                return
+        start_time = time.perf_counter()
+        deadline = start_time + self.get_budget() / 1000
+
+        partials = [path for path in self.pool[:self.partials] if not path.done]
+        others = [path for path in self.pool[self.partials:] if not path.done]
+
+        if len(others) > 0:
+            self.turn %= len(others)
+            others = others[self.turn:] + others[:self.turn]
+            self.turn += 1
+
+        # Deterministic games search a fixed amount each frame, so runs can be repeated exactly.
+        if getattr(self.game, "deterministic", False):
+            self.search_fixed((partials, others))
+        else:
+            # Give every path a slice of work in turn, skipping paths that can make no progress.
+            for queue in (partials, others):
+                while len(queue) > 0 and time.perf_counter() < deadline:
+                    for path in list(queue):
+                        now = time.perf_counter()
+                        if now >= deadline:
+                            break
+
+                        # Shrink the slice to fit the remaining time.
+                        remaining = (deadline - now) * 1000
+                        iterations = max(1, min(self.slice, int(remaining / self.iteration_time)))
+
+                        expanded = path.nodes_expanded
+                        path.search(iterations)
+                        expanded = path.nodes_expanded - expanded if not path.done else iterations
+
+                        if path.done or expanded == 0:
+                            queue.remove(path)
+
+                        # Keep a running average of the time taken per iteration.
+                        if expanded > 0:
+                            taken = (time.perf_counter() - now) * 1000 / expanded
+                            self.iteration_time = self.iteration_time * 0.8 + taken * 0.2
+
+        if self.cache is not None:
+            self.save_cache()
+
+        self.last_update_time = (time.perf_counter() - start_time) * 1000
+
+    def search_fixed(self, queues):
+        """
+        Gives every path a slice of work in turn, until a fixed number of
+        iterations have been used, skipping paths that can make no progress.
+
+        Args:
+            queues (list(list(Path))): The unfinished paths, in the order to search them.
+
+        """
+        remaining = self.fixed_iterations
+
+        for queue in queues:
+            while len(queue) > 0 and remaining > 0:
+                for path in list(queue):
+                    if remaining <= 0:
+                        break
+
+                    iterations = min(self.slice, remaining)
+
+                    expanded = path.nodes_expanded
+                    path.search(iterations)
+                    expanded = path.nodes_expanded - expanded if not path.done else iterations
+                    remaining -= expanded
+
+                    if path.done or expanded == 0:
+                        queue.remove(path)
+
+    def get_budget(self):
+        """
+        Works out how long path searches can take this frame.
+        Uses the time the rest of the last frame took, measured by the game's clock.
+
+        Returns:
+            (float): The time budget in milliseconds.
+
+        """
+        clock = getattr(self.game, "clock", None)
+        if clock is None:
+            return self.max_budget
+
+        other_time = clock.get_rawtime() - self.last_update_time
+        spare = self.frame_time - other_time - self.min_budget
+
+        return max(self.min_budget, min(self.max_budget, spare))
 
     def get_path(self):
         """
@@ -170,31 +443,85 @@ class Pathfinding:
         while attempts > 0:
             attempts -= 1
 
-            path = self.pool[random.randint(self.partials, len(self.pool) - 1)] 
+            path = self.pool[self.random.randint(self.partials, len(self.pool) - 1)] 
             
-            if path.done and path.start[0] >= self.game.window.resolution[0]:
+            if path.done and self.is_full_path(path):
                 return path
 
         return self.get_partial_path(self.find_start())[0]
 
-    def repair(self, point):
+    def get_flow_field(self):
+        """
+        Gets the shared flow field, calculating it the first time it is used.
+
+        Returns:
+            (FlowField): The flow field for the current level, up to date with
+            any blocked or cleared tiles.
+
+        """
+        if self.flow is None:
+            self.flow = FlowField(self)
+            self.flow.compute()
+
+        self.flow.refresh()
+        return self.flow
+
+    def tiles_changed(self, blocked, cleared):
         """
-        Called when a point has been blocked by a turret.
-        Triggers path repair and regeneration (if needed).
+        Called by the collision grid when tiles are blocked or cleared.
 
         Args:
-            point (int, int): The point that is now blocked.
+            blocked (list(int, int)): The points that are now blocked.
+            cleared (list(int, int)): The points that are now clear.
 
         """
-        for path in self.pool:
-            # Repair paths that contain the point.
-            if path.done and point in path.points:
-                path.repair(point)
+        if len(blocked) > 0:
+            self.repair(blocked)
+        if len(cleared) > 0:
+            self.unblocked(cleared)
+
+    def repair(self, points):
+        """
+        Called when points have been blocked by a turret.
+        Triggers path repair and regeneration (if needed), once for all the points.
+
+        Args:
+            points (list(int, int)): The points that are now blocked.
+
+        """
+        # Incremental paths update their existing search instead.
+        if getattr(self.game, "pathfinding_algo", "astar") == "dstar_lite":
+            for path in self.pool:
+                path.update_tiles(points)
+            return
+
+        # Repair paths that contain the points, each path once.
+        paths = { }
+        for point in points:
+            for path in self.usage.get(self.grid.to_index(point), ()):
+                paths.setdefault(path, []).append(point)
+
+        for path, blocked in paths.items():
+            path.repair(blocked)
 
-            # Restart calculations of paths that may include the point.
-            if not path.done and (point in path.open_set or point in path.closed_set):
+        # Restart calculations of paths that may include the points.
+        for path in self.pool:
+            if not path.done and any(path.visited(point) for point in points):
                 path.start_search()
 
+    def unblocked(self, points):
+        """
+        Called when points are no longer blocked.
+        Paths remain valid, but incremental paths may have shorter routes.
+
+        Args:
+            points (list(int, int)): The points that are now clear.
+
+        """
+        if getattr(self.game, "pathfinding_algo", "astar") == "dstar_lite":
+            for path in self.pool:
+                path.update_tiles(points)
+
     def get_partial_path(self, point):
         """
         Gets or creates a path that starts or passes through the given point.
@@ -208,15 +535,18 @@ class Pathfinding:
 
         """
         # Try intersecting paths.
+        index = self.grid.to_index(point)
+        for path in self.usage.get(index, ()):
+            return path, point
+
         for path in self.pool:
-            if (path.done and point in path.points) or path.start == point:
+            if path.start == point:
                 return path, point
 
         # Try paths that intersect with neighbours.
-        for neighbour in self.pool[0].get_neighbours(point):
-            for path in self.pool:
-                if path.done and neighbour in path.points:
-                    return path, neighbour
+        for neighbour in self.grid.neighbours(index):
+            for path in self.usage.get(neighbour, ()):
+                return path, self.grid.to_point(neighbour)
 
         # No suitable path, make a new one.
         path = Path(self, point)
@@ -224,22 +554,118 @@ class Pathfinding:
         self.partials += 1
         return path, point
 
-    def is_critical(self, point):
+    def is_critical(self, points):
         """
-        Works out if blocking the given point may make reaching the finish impossible.
-       
+        Works out if blocking the given points would cut off a start tile from the finish.
+
+        If the clear tiles around the blocked area are all connected to each
+        other, any route through the area can go around it instead, so the
+        answer is found without a search. Otherwise the level is searched again
+        with the points blocked, and compared with the start tiles that can
+        reach the finish now. Those are read from the flow field if enemies
+        already use one, or found with a second search.
+
         Args:
-            point (int, int): The point to check.
+            points (list(int, int)): The top left points of the tiles to block,
+                which must fill a rectangle.
 
         Returns:
-            True if the point must be kept clear, otherwise returns False.
+            True if the points must be kept clear, otherwise returns False.
 
         """
-        for path in self.pool:
-            if path.done and path.start[0] >= self.game.window.resolution[0] and point not in path.points:
-                return False
+        tiles = set(self.grid.to_index(point) for point in points)
+        tiles = set(index for index in tiles if not self.grid.blocked(index))
+
+        if len(tiles) == 0:
+            return False
+
+        # The shortcut assumes the area is crossed, not started or finished in.
+        edges = any(self.grid.is_start(index) or self.grid.is_goal(index) for index in tiles)
+        if not edges and self.grid.ring_connected(tiles):
+            return False
+
+        reachable = self.grid.reachable(tiles)
+
+        # Read the flow field if enemies already follow one, rather than creating it here.
+        if self.flow is not None:
+            self.flow.refresh()
+            connected = [index for index in self.grid.starts if self.flow.distance[index] < float("inf")]
+        else:
+            before = self.grid.reachable(set())
+            connected = [index for index in self.grid.starts if index in before]
+
+        for index in connected:
+            if index not in reachable:
+                return True
+
+        return False
+
+
+class SearchSettings:
+    """
+    Stands in for the game in worker processes.
+    Holds only the settings that path searches read.
+    """
+    def __init__(self, resolution, algo, metric):
+        """
+        Constructor.
+
+        Args:
+            resolution (int, int): The screen resolution.
+            algo (str): The pathfinding algorithm.
+            metric (str): The distance metric.
+
+        """
+        # Searches read the resolution through game.window.
+        self.window = self
+        self.resolution = resolution
+        self.pathfinding_algo = algo
+        self.distance_metric = metric
+        self.show_path_debug = False
+
+
+def solve_paths(collision, resolution, starts, algo, metric):
+    """
+    Solves a batch of paths to completion. Run in a worker process by
+    Pathfinding.solve_parallel().
 
-        return True
+    Paths in the batch are solved in order and avoid crowding the earlier ones,
+    as they would in the game, but do not know about other batches.
+
+    Args:
+        collision (Collision): A detached copy of the collision grid.
+        resolution (int, int): The screen resolution.
+        starts (list(int, int)): The start of each path.
+        algo (str): The pathfinding algorithm.
+        metric (str): The distance metric.
+
+    Returns:
+        (list((list(int, int), int))): The points (None if no path was found)
+        and the number of nodes expanded for each start.
+
+    """
+    pathfinding = Pathfinding(SearchSettings(resolution, algo, metric), collision)
+    metrics = pathfinding.metrics[algo]
+    results = []
+
+    for start in starts:
+        path = Path(pathfinding, start)
+        pathfinding.pool.append(path)
+        expanded = metrics["total_nodes_expanded"]
+
+        while not path.done:
+            before = path.nodes_expanded
+            path.search(pathfinding.grid.size)
+
+            if not path.done and path.nodes_expanded == before:
+                break
+
+        if path.done:
+            results.append((path.points, metrics["total_nodes_expanded"] - expanded))
+        else:
+            results.append((None, path.nodes_expanded))
+
+    return results
 
 
 class Path:
@@ -262,12 +688,14 @@ class Path:
         res = self.res
         
         # Draw open set
-        for (x, y) in self.open_set:
+        for (x, y) in map(self.grid.to_point, self.open_set):
             pygame.draw.rect(surface, (0, 255, 0), (x, y, res, res), 1)
 
         # Draw closed set
-        for (x, y) in self.closed_set:
-            pygame.draw.rect(surface, (255, 0, 0), (x, y, res, res), 1)
+        for index in range(self.grid.size):
+            if self.closed[index] == self.generation:
+                x, y = self.grid.to_point(index)
+                pygame.draw.rect(surface, (255, 0, 0), (x, y, res, res), 1)
 
         # Draw path if available
         if self.points:
@@ -286,8 +714,25 @@ class Path:
         self.start = start
         self.pathfinding = pathfinding
         self.collision = self.pathfinding.collision
+        self.grid = self.pathfinding.grid
+        self.start_index = self.grid.to_index(start)
         self.res = self.collision.tile_size
         self.points = None
+        self.positions = { }
+        self.indexed = []
+        self.nodes_used = 0
+
+        # Search state, indexed by grid tile. Entries are only valid
+        # when their seen/closed value matches the current generation.
+        size = self.grid.size
+        self.generation = 0
+        self.seen = array("I", [0]) * size
+        self.closed = array("I", [0]) * size
+        self.scores = array("d", [0.0]) * size
+        self.came_from = array("i", [-1]) * size
+        self.rhs = None
+        self.open_set = OpenSet()
+
         self.start_search()
 
     def next(self, current):
@@ -301,117 +746,180 @@ class Path:
             (int, int) if successful, False if there are no more points in the path.
 
         """
-        if  current not in self.points:
-            return False
+        index = self.positions.get(current)
 
-        index = self.points.index(current)
-        length = len(self.points)
-
-        if index + 1 == length:
+        if index is None or index + 1 == len(self.points):
             return False
 
         return self.points[index + 1]
 
+    def contains(self, point):
+        """
+        Checks if the path's points include the given point.
+
+        Args:
+            point (int, int): The point to check.
+
+        Returns:
+            True if the point is in the path, otherwise False.
+
+        """
+        return point in self.positions
+
+    def update_positions(self):
+        """
+        Rebuilds the lookup from each point to its position in the path.
+        Must be called whenever the points change.
+        """
+        self.positions = { }
+
+        # Keep the first position of any repeated point.
+        for index, point in enumerate(self.points):
+            self.positions.setdefault(point, index)
+
     def start_search(self):
         """
         (Re)starts the pathfinding search.
         """
+        self.pathfinding.unindex_path(self)
         self.done = False
-        self.closed_set = set()
-        self.open_set = {self.start}
-        self.scores = {self.start: 0}
-        self.came_from = { }
+        self.nodes_expanded = 0
+        self.generation += 1
+        self.open_set.clear()
+
+        start = self.start_index
+        self.seen[start] = self.generation
+        self.scores[start] = 0
+        self.came_from[start] = -1
+        self.open_set.push(start, 0)
+        self.dstar_ready = False
+
+    def complete(self, points, cached=False):
+        """
+        Stores the finished path, making it available to enemies,
+        and adds it to the metrics for the current algorithm.
+
+        Args:
+            points (list(int, int)): The points in the path.
+            cached (bool): True if the path was loaded from the path cache. It
+                is then only counted as a cached path, as no search was run.
+
+        """
+        self.points = points
+        self.update_positions()
+        self.done = True
+        self.pathfinding.index_path(self)
+
+        algo = getattr(self.pathfinding.game, "pathfinding_algo", "astar")
+        metrics = self.pathfinding.metrics[algo]
+        self.nodes_used = self.nodes_expanded
+
+        if cached:
+            metrics["paths_cached"] += 1
+        else:
+            metrics["paths_completed"] += 1
+            metrics["total_nodes_expanded"] += self.nodes_expanded
+            metrics["total_path_length"] += len(self.points)
+            metrics["paths_attempted"] += 1
+
+        self.nodes_expanded = 0
+
+    def visited(self, point):
+        """
+        Checks if the current search has reached the given point.
+
+        Args:
+            point (int, int): The point to check.
+
+        Returns:
+            True if the point is in the open or closed set, otherwise False.
+
+        """
+        return self.seen[self.grid.to_index(point)] == self.generation
     
-    def search(self):
+    def search(self, iterations=25):
         """
         Chooses algorithm based on game setting.
+
+        Args:
+            iterations (int): The maximum number of nodes to expand.
+
         """
         algo = getattr(self.pathfinding.game, "pathfinding_algo", "astar")
         if algo == "greedy":
-            return self.search_greedy()
+            return self.search_greedy(iterations)
         elif algo == "dijkstra":
-            return self.search_dijkstra()
+            return self.search_dijkstra(iterations)
+        elif algo == "dstar_lite":
+            return self.search_dstar_lite(iterations)
         else:
-            return self.search_astar()
+            return self.search_astar(iterations)
     
-    def search_greedy(self):
+    def search_greedy(self, iterations):
         """
         Greedy Best First Search implementation.
         Uses only heuristic (no path cost).
+
+        Args:
+            iterations (int): The maximum number of nodes to expand.
         """
-        iterations = 25
-        nodes_expanded = 0
         while len(self.open_set) > 0 and iterations > 0:
             iterations -= 1
-            nodes_expanded += 1
+            self.nodes_expanded += 1
 
             # Select node with smallest heuristic
-            current = min(self.open_set, key=lambda p: self.heuristic(p))
+            current, _ = self.open_set.pop()
 
             # Check if goal reached
-            if current[0] < 0:
-                self.points = self.trace_path(current, self.came_from)
-                self.done = True
-                # --- ADD METRICS UPDATE ---
-                algo = getattr(self.pathfinding.game, "pathfinding_algo", "greedy")
-                self.pathfinding.metrics[algo]["paths_completed"] += 1
-                self.pathfinding.metrics[algo]["total_nodes_expanded"] += nodes_expanded
-                self.pathfinding.metrics[algo]["total_path_length"] += len(self.points)
-                self.pathfinding.metrics[algo]["paths_attempted"] += 1
+            if self.grid.is_goal(current):
+                self.complete(self.trace_path(current, self.came_from))
                 return
 
-            self.open_set.remove(current)
-            self.closed_set.add(current)
+            self.closed[current] = self.generation
 
             # Explore neighbours
-            for neighbour in self.get_neighbours(current):
-                if neighbour in self.closed_set:
+            for neighbour in self.grid.neighbours(current):
+                if self.closed[neighbour] == self.generation:
                     continue
 
                 if neighbour not in self.open_set:
+                    self.seen[neighbour] = self.generation
                     self.came_from[neighbour] = current
-                    self.open_set.add(neighbour)
+                    self.open_set.push(neighbour, self.heuristic(neighbour))
 
         # Optional: visualize each frame
         if hasattr(self.pathfinding, "game") and hasattr(self.pathfinding.game, "window"):
             if self.pathfinding.game.show_path_debug:
                 self.draw_debug()
 
-    def search_astar(self):
+    def search_astar(self, iterations):
         """
         Starts or continues an A* search for an appropriate path.
         Draws debug visualization if enabled.
+
+        Args:
+            iterations (int): The maximum number of nodes to expand.
         """
-        iterations = 25
-        nodes_expanded = 0
         while len(self.open_set) > 0 and iterations > 0:
             iterations -= 1
-            nodes_expanded += 1
+            self.nodes_expanded += 1
 
             # Find the next node to evaluate.
-            current, current_score = self.get_lowest_score(self.open_set, self.scores)
+            current, current_score = self.open_set.pop()
 
             # Check if it is a destination
-            if current[0] < 0:
-                self.points = self.trace_path(current, self.came_from)
-                self.done = True
-                # --- ADD METRICS UPDATE ---
-                algo = getattr(self.pathfinding.game, "pathfinding_algo", "astar")
-                self.pathfinding.metrics[algo]["paths_completed"] += 1
-                self.pathfinding.metrics[algo]["total_nodes_expanded"] += nodes_expanded
-                self.pathfinding.metrics[algo]["total_path_length"] += len(self.points)
-                self.pathfinding.metrics[algo]["paths_attempted"] += 1
+            if self.grid.is_goal(current):
+                self.complete(self.trace_path(current, self.came_from))
                 return
 
-            # Remove from the open set and move to closed
-            self.open_set.remove(current)
-            self.closed_set.add(current)
+            # Popping removed it from the open set, move to closed
+            self.closed[current] = self.generation
 
             # Consider each neighbour
-            for neighbour in self.get_neighbours(current):
+            for neighbour in self.grid.neighbours(current):
 
                 # Skip if already in closed set
-                if neighbour in self.closed_set:
+                if self.closed[neighbour] == self.generation:
                     continue
 
                 g = current_score + self.get_cost(current, neighbour)
@@ -420,50 +928,42 @@ class Path:
                 exists = (neighbour in self.open_set)
 
                 if not exists or self.scores[neighbour] > score:
+                    self.seen[neighbour] = self.generation
                     self.scores[neighbour] = score
                     self.came_from[neighbour] = current
-
-                if not exists:
-                    self.open_set.add(neighbour)
+                    self.open_set.push(neighbour, score)
 
         #visualize every frame
         if hasattr(self.pathfinding, "game") and hasattr(self.pathfinding.game, "window"):
             if self.pathfinding.game.show_path_debug:
                 self.draw_debug()
 
-    def search_dijkstra(self):
+    def search_dijkstra(self, iterations):
         """
         Dijkstra's Algorithm (Uniform Cost Search)
         Finds the shortest path without using a heuristic.
-        """
-        iterations = 25
-        nodes_expanded = 0
 
+        Args:
+            iterations (int): The maximum number of nodes to expand.
+        """
         while len(self.open_set) > 0 and iterations > 0:
             iterations -= 1
-            nodes_expanded += 1
+            self.nodes_expanded += 1
 
             # Select node with lowest cost so far (no heuristic)
-            current, current_cost = self.get_lowest_score(self.open_set, self.scores)
+            current, current_cost = self.open_set.pop()
 
             # Check if goal reached (left edge)
-            if current[0] < 0:
-                self.points = self.trace_path(current, self.came_from)
-                self.done = True
-                algo = "dijkstra"
-                self.pathfinding.metrics[algo]["paths_completed"] += 1
-                self.pathfinding.metrics[algo]["total_nodes_expanded"] += nodes_expanded
-                self.pathfinding.metrics[algo]["total_path_length"] += len(self.points)
-                self.pathfinding.metrics[algo]["paths_attempted"] += 1
+            if self.grid.is_goal(current):
+                self.complete(self.trace_path(current, self.came_from))
                 return
 
-            # Move from open to closed
-            self.open_set.remove(current)
-            self.closed_set.add(current)
+            # Popping removed it from the open set, move to closed
+            self.closed[current] = self.generation
 
             # Explore neighbours
-            for neighbour in self.get_neighbours(current):
-                if neighbour in self.closed_set:
+            for neighbour in self.grid.neighbours(current):
+                if self.closed[neighbour] == self.generation:
                     continue
 
                 # Dijkstra cost = distance so far + move cost
@@ -471,155 +971,375 @@ class Path:
                 exists = neighbour in self.open_set
 
                 # If new or cheaper path found
-                if not exists or new_cost < self.scores.get(neighbour, float("inf")):
+                if not exists or new_cost < self.scores[neighbour]:
+                    self.seen[neighbour] = self.generation
                     self.scores[neighbour] = new_cost
                     self.came_from[neighbour] = current
-                    if not exists:
-                        self.open_set.add(neighbour)
+                    self.open_set.push(neighbour, new_cost)
 
             #draw visual debug
             if hasattr(self.pathfinding.game, "show_path_debug") and self.pathfinding.game.show_path_debug:
                 self.draw_debug()
 
-    
-    def heuristic(self, position):
+
+    def search_dstar_lite(self, iterations):
         """
-        Heuristic for Greedy Best First Search and A*.
-        Uses one of the 3 distance measures from the current position to the left edge (goal area).
+        Starts or continues a D* Lite search.
+
+        Searches backwards from the goal column to the start, keeping g and rhs
+        values between searches so that blocking a tile only updates the area
+        around it (see update_tiles). The start never moves, so no key modifier
+        is needed.
+
+        Edge costs leave out crowding, because D* Lite relies on the costs only
+        changing when it is told about them.
+
+        Args:
+            iterations (int): The maximum number of nodes to expand.
         """
-        goal = (0, position[1])  
-        metric = getattr(self.pathfinding.game, "distance_metric", "manhattan")
+        if not self.dstar_ready:
+            self.start_dstar_lite()
 
-        dx = abs(position[0] - goal[0])
-        dy = abs(position[1] - goal[1])
+        start = self.start_index
+        finished = False
 
-        if metric == "euclidean":
-            return (dx ** 2 + dy ** 2) ** 0.5
-        elif metric == "chebyshev":
-            return max(dx, dy)
-        else:  # default to full Manhattan
-            return dx + dy
+        while iterations > 0:
+            if self.dstar_finished():
+                finished = True
+                break
 
-    def get_lowest_score(self, open_set, scores):
+            iterations -= 1
+            self.nodes_expanded += 1
+            top, top_key = self.open_set.pop()
+
+            if self.dstar_g(top) > self.dstar_rhs(top):
+                # Overconsistent, the new route is shorter.
+                self.scores[top] = self.rhs[top]
+                for previous in self.grid.predecessors(top):
+                    self.dstar_update_vertex(previous)
+            else:
+                # Underconsistent, the old route got longer.
+                self.scores[top] = float("inf")
+                for previous in self.grid.predecessors(top) + [top]:
+                    self.dstar_update_vertex(previous)
+
+        if finished and self.dstar_g(start) < float("inf"):
+            self.complete(self.dstar_trace_path(start))
+
+        if hasattr(self.pathfinding.game, "show_path_debug") and self.pathfinding.game.show_path_debug:
+            self.draw_debug()
+
+    def dstar_finished(self):
         """
-        Finds the point with the lowest score.
-       
-        Args:
-            open_set (set(int, int)): A set of possible points
-            scores (list(int)): A list with the score of each position.
+        Returns True if the D* Lite search has found the cheapest route from the start.
+        """
+        top, top_key = self.open_set.peek()
+        start = self.start_index
 
-        Returns:
-           ((int, int), int) The lowest scoring point and its score.
+        return top is None or (top_key >= self.dstar_key(start) and self.dstar_rhs(start) == self.dstar_g(start))
 
+    def start_dstar_lite(self):
+        """
+        Sets up the D* Lite search state, with every goal tile as a target.
+        Reuses the search buffers, so any forward search state is discarded.
         """
-        lowest_score = 999999999
-        lowest_point = (0, 0)
+        if self.rhs is None:
+            self.rhs = array("d", [0.0]) * self.grid.size
 
-        for p in open_set:
-            score = scores[p]
+        self.generation += 1
+        self.open_set.clear()
 
-            if lowest_score > score:
-                lowest_score = score
-                lowest_point = p
+        for goal in self.grid.goals:
+            self.dstar_touch(goal)
+            self.rhs[goal] = 0
+            self.open_set.push(goal, self.dstar_key(goal))
 
-        return lowest_point, lowest_score
+        self.dstar_ready = True
 
-    def get_neighbours(self, position):
+    def dstar_touch(self, index):
         """
-        Finds a list of neighbouring tiles for the given position.
+        Marks a tile as part of the current D* Lite search, initialising its values.
 
         Args:
-            position (int, int): The start position.
+            index (int): The grid index of the tile.
 
-        Returns:
-            A list of (int, int) tuples.
+        """
+        if self.seen[index] != self.generation:
+            self.seen[index] = self.generation
+            self.scores[index] = float("inf")
+            self.rhs[index] = float("inf")
 
+    def dstar_g(self, index):
         """
-        if position[0] >=  self.pathfinding.game.window.resolution[0]:
-            return [(position[0] - self.res, position[1])]
+        Returns the current cost from a tile to the goal, or infinity if unknown.
+        """
+        return self.scores[index] if self.seen[index] == self.generation else float("inf")
 
-        x_diff = range(position[0] - self.res, position[0] + self.res + 1, self.res)
-        y_diff = range(position[1] - self.res, position[1] + self.res + 1, self.res)
+    def dstar_rhs(self, index):
+        """
+        Returns the one step lookahead cost from a tile to the goal, or infinity if unknown.
+        """
+        return self.rhs[index] if self.seen[index] == self.generation else float("inf")
 
-        return [(x, y) for x in x_diff for y in y_diff if (x, y) != position and (x == position[0] or y == position[1] or self.can_use_diagonal(position, (x, y))) and not self.collision.point_blocked(x, y)]
-        
-    def can_use_diagonal(self, a, b):
+    def dstar_key(self, index):
         """
-        Returns true if the diagonal between a and b is clear.
+        Calculates the priority of a tile in the D* Lite open set.
 
         Args:
-            a (int, int): Position a.
-            b (int, int): Position b.
+            index (int): The grid index of the tile.
 
         Returns:
-            (bool) True if the diagonal is clear, otherwise False.
+            (float, float) The primary and secondary keys.
 
         """
-        return not self.collision.point_blocked(b[0], a[1]) and not self.collision.point_blocked(a[0], b[1])
+        best = min(self.dstar_g(index), self.dstar_rhs(index))
+        return (best + self.dstar_heuristic(index), best)
 
-    def get_cost(self, a, b):
+    def dstar_heuristic(self, index):
         """
-        Calculates the cost of moving between the given positions.
-        
+        Estimates the cost from the start to the given tile.
+        Uses the octile distance with the base move costs, so it never overestimates.
+
         Args:
-            a (int, int): Position a.
-            b (int, int): Position b.
-            
-        Returns:
-            (int) The cost of moving from a to b.
-          
+            index (int): The grid index of the tile.
+
         """
-        base = 3 if a[0] == b[0] or a[1] == b[1] else 4
-        crowding = self.pathfinding.get_point_usage(b)
+        start = self.start_index
+        dx = abs(self.grid.xs[index] - self.grid.xs[start]) // self.res
+        dy = abs(self.grid.ys[index] - self.grid.ys[start]) // self.res
 
-        return base + crowding
+        return 3 * max(dx, dy) + min(dx, dy)
 
-    def trace_path(self, current, came_from):
+    def dstar_cost(self, a, b):
         """
-        Traces a finished path from finish to start.
+        Calculates the cost of moving between adjacent tiles, without crowding.
 
         Args:
-            current (int, int): The last position in the path.
-            came_from (dict): The location each position was reached from.
+            a (int): The grid index of position a.
+            b (int): The grid index of position b.
 
         Returns:
-            (list(int, int)): A list of points in the path.
+            (int) The cost of moving from a to b.
 
         """
-        path = [ current ]
-        while current in came_from:
-            current = came_from[current]
-            path.insert(0, current)
-
-        return path
+        return 3 if self.grid.xs[a] == self.grid.xs[b] or self.grid.ys[a] == self.grid.ys[b] else 4
 
-    def repair(self, point):
+    def dstar_update_vertex(self, index):
         """
-        Attempts to repair a path after a point is blocked.
-        
+        Recalculates the rhs value of a tile and queues it if it is inconsistent.
+
         Args:
-            point (int, int): The blocked point.
+            index (int): The grid index of the tile.
 
         """
-        index = self.points.index(point)
+        self.dstar_touch(index)
 
-        if index != 0 and index < len(self.points) - 1:
-            previous = self.points[index - 1]
-            next = self.points[index + 1]
+        if not self.grid.is_goal(index):
+            best = float("inf")
 
-            previous_neighbours = self.get_neighbours(previous)
-            next_neighbours = self.get_neighbours(next)
+            for neighbour in self.grid.neighbours(index):
+                if not self.grid.blocked(neighbour):
+                    best = min(best, self.dstar_cost(index, neighbour) + self.dstar_g(neighbour))
 
-            # If next and previous are adjacent, just remove the point.
+            self.rhs[index] = best
+
+        if self.scores[index] != self.rhs[index]:
+            self.open_set.push(index, self.dstar_key(index))
+        else:
+            self.open_set.discard(index)
+
+    def dstar_trace_path(self, start):
+        """
+        Follows the lowest cost moves from the start to the goal column.
+
+        Args:
+            start (int): The grid index of the start tile.
+
+        Returns:
+            (list(int, int)): A list of points in the path.
+
+        """
+        current = start
+        path = [ self.grid.to_point(current) ]
+
+        while not self.grid.is_goal(current):
+            best = None
+            best_cost = float("inf")
+
+            # Only step to tiles closer to the goal, so the path cannot loop.
+            for neighbour in self.grid.neighbours(current):
+                g = self.dstar_g(neighbour)
+
+                if not self.grid.blocked(neighbour) and g < self.dstar_g(current) and self.dstar_cost(current, neighbour) + g < best_cost:
+                    best = neighbour
+                    best_cost = self.dstar_cost(current, neighbour) + g
+
+            if best is None:
+                break
+
+            current = best
+            path.append(self.grid.to_point(current))
+
+        return path
+
+    def update_tiles(self, points):
+        """
+        Updates a D* Lite search after tiles are blocked or cleared.
+        Only the tiles around them are re-evaluated, and the search continues
+        from its previous state.
+
+        Args:
+            points (list(int, int)): The tiles that changed.
+
+        """
+        changed = [self.grid.to_index(point) for point in points]
+
+        # Paths solved elsewhere (in another process or loaded from the
+        # path cache) have no search state yet, and are searched from scratch.
+        if self.dstar_ready:
+            for tile in changed:
+                for index in [tile] + self.grid.around(tile):
+                    self.dstar_update_vertex(index)
+
+        # Replan if the path went through or next to a tile, as blocking the
+        # corner of a diagonal move breaks the path even when another route
+        # costs the same, or if the change affected the cheapest route.
+        if not self.done:
+            return
+
+        nearby = set(changed)
+        for tile in changed:
+            nearby.update(self.grid.around(tile))
+
+        if any(self.grid.to_point(index) in self.positions for index in nearby) or (self.dstar_ready and not self.dstar_finished()):
+            self.pathfinding.unindex_path(self)
+            self.done = False
+
+    def heuristic(self, index):
+        """
+        Heuristic for Greedy Best First Search and A*.
+        Uses one of the 3 distance measures from the current position to the left edge (goal area).
+
+        Args:
+            index (int): The grid index of the current position.
+
+        """
+        x = self.grid.xs[index]
+        y = self.grid.ys[index]
+        goal = (0, y)
+        metric = getattr(self.pathfinding.game, "distance_metric", "manhattan")
+
+        dx = abs(x - goal[0])
+        dy = abs(y - goal[1])
+
+        if metric == "euclidean":
+            return (dx ** 2 + dy ** 2) ** 0.5
+        elif metric == "chebyshev":
+            return max(dx, dy)
+        else:  # default to full Manhattan
+            return dx + dy
+
+    def get_neighbours(self, position):
+        """
+        Finds a list of neighbouring tiles for the given position.
+
+        Args:
+            position (int, int): The start position.
+
+        Returns:
+            A list of (int, int) tuples.
+
+        """
+        return [self.grid.to_point(index) for index in self.grid.neighbours(self.grid.to_index(position))]
+
+    def get_cost(self, a, b):
+        """
+        Calculates the cost of moving between the given positions.
+        
+        Args:
+            a (int): The grid index of position a.
+            b (int): The grid index of position b.
+            
+        Returns:
+            (int) The cost of moving from a to b.
+          
+        """
+        base = 3 if self.grid.xs[a] == self.grid.xs[b] or self.grid.ys[a] == self.grid.ys[b] else 4
+        crowding = self.pathfinding.get_index_usage(b)
+
+        return base + crowding
+
+    def trace_path(self, current, came_from):
+        """
+        Traces a finished path from finish to start.
+
+        Args:
+            current (int): The grid index of the last position in the path.
+            came_from (array(int)): The index each position was reached from, or -1 at the start.
+
+        Returns:
+            (list(int, int)): A list of points in the path.
+
+        """
+        path = [ self.grid.to_point(current) ]
+        while came_from[current] != -1:
+            current = came_from[current]
+            path.append(self.grid.to_point(current))
+
+        path.reverse()
+        return path
+
+    def repair(self, points):
+        """
+        Attempts to repair a path after some of its points are blocked.
+        
+        Args:
+            points (list(int, int)): The blocked points in the path.
+
+        """
+        for point in points:
+            if point not in self.positions:
+                continue
+
+            if not self.patch(point):
+                # No solution, remake path.
+                self.start_search()
+                return
+
+            self.update_positions()
+
+        self.pathfinding.index_path(self)
+
+    def patch(self, point):
+        """
+        Tries to route a path around a blocked point, using nearby tiles.
+
+        Args:
+            point (int, int): The blocked point.
+
+        Returns:
+            True if the path was patched, otherwise False.
+
+        """
+        index = self.positions[point]
+
+        if index != 0 and index < len(self.points) - 1:
+            previous = self.points[index - 1]
+            next = self.points[index + 1]
+
+            previous_neighbours = self.get_neighbours(previous)
+            next_neighbours = self.get_neighbours(next)
+
+            # If next and previous are adjacent, just remove the point.
             if next in previous_neighbours:
                 self.points.remove(point)
-                return
+                return True
 
             # If not, check for a common neighbour.
             for neighbour in previous_neighbours:
                 if neighbour in next_neighbours:
                     self.points[index] = neighbour
-                    return
+                    return True
 
             # If not, check neighbours of neighbours.
             for neighbour in previous_neighbours:
@@ -627,7 +1347,602 @@ class Path:
                     if neighbour_neighbour in next_neighbours:
                         self.points[index] = neighbour
                         self.points.insert(index + 1, neighbour_neighbour)
-                        return
+                        return True
 
-        # No solution, remake path.
-        self.start_search()
+        return False
+
+
+class FlowField:
+    """
+    Distances to the finish from every tile, shared by all enemies.
+
+    Calculated with a reverse Dijkstra search from the goal column, so the
+    next tile towards the finish can be looked up from anywhere in the level.
+    Blocking or clearing a tile only updates the tiles whose routes change,
+    the next time the field is used.
+    """
+
+    def __init__(self, pathfinding):
+        """
+        Constructor.
+
+        Args:
+            pathfinding (Pathfinding): The pathfinding manager instance.
+
+        """
+        self.grid = pathfinding.grid
+        self.collision = pathfinding.collision
+        self.distance = array("d", [float("inf")]) * self.grid.size
+        self.next_index = array("i", [-1]) * self.grid.size
+
+        # Tiles changed since the field was last updated { point: None }.
+        self.dirty = { }
+        self.collision.subscribe(self.tiles_changed)
+
+    def tiles_changed(self, blocked, cleared):
+        """
+        Called by the collision grid when tiles are blocked or cleared.
+        Records the tiles, to be updated by refresh().
+
+        Args:
+            blocked (list(int, int)): The points that are now blocked.
+            cleared (list(int, int)): The points that are now clear.
+
+        """
+        for point in blocked + cleared:
+            self.dirty[point] = None
+
+    def refresh(self):
+        """
+        Updates the field for any tiles that changed since it was last used.
+        """
+        if len(self.dirty) == 0:
+            return
+
+        points = list(self.dirty)
+        self.dirty = { }
+
+        blocked = [point for point in points if self.collision.point_blocked(*point)]
+        cleared = [point for point in points if not self.collision.point_blocked(*point)]
+
+        if len(blocked) > 0:
+            self.block(blocked)
+        if len(cleared) > 0:
+            self.unblock(cleared)
+
+    def next(self, current):
+        """
+        Gets the next point towards the finish.
+
+        Args:
+            current (int, int): The current point.
+
+        Returns:
+            (int, int) The next point, or the current point if the finish cannot
+            be reached from it. False if the current point is at the finish.
+
+        """
+        self.refresh()
+        index = self.grid.to_index(current)
+
+        if self.grid.is_goal(index):
+            return False
+
+        if self.next_index[index] == -1:
+            return current
+
+        return self.grid.to_point(self.next_index[index])
+
+    def get_cost(self, a, b):
+        """
+        Calculates the cost of moving between adjacent tiles.
+        Matches the base cost used by Path.get_cost, without crowding.
+
+        Args:
+            a (int): The grid index of position a.
+            b (int): The grid index of position b.
+
+        Returns:
+            (int) The cost of moving from a to b.
+
+        """
+        return 3 if self.grid.xs[a] == self.grid.xs[b] or self.grid.ys[a] == self.grid.ys[b] else 4
+
+    def compute(self):
+        """
+        Calculates the whole field from scratch.
+        """
+        self.dirty = { }
+        heap = []
+
+        for index in range(self.grid.size):
+            self.next_index[index] = -1
+
+            if self.grid.is_goal(index):
+                self.distance[index] = 0
+                heap.append((0, index))
+            else:
+                self.distance[index] = float("inf")
+
+        heapq.heapify(heap)
+        self.propagate(heap)
+
+    def propagate(self, heap):
+        """
+        Lowers the distances of tiles leading onto the tiles in the heap,
+        continuing until no more distances change.
+
+        Args:
+            heap (list(float, int)): A heap of (distance, grid index) entries.
+
+        """
+        distance = self.distance
+
+        while len(heap) > 0:
+            current_distance, current = heapq.heappop(heap)
+
+            # Skip entries that were replaced by a shorter route.
+            if current_distance > distance[current]:
+                continue
+
+            for previous in self.grid.predecessors(current):
+                new_distance = current_distance + self.get_cost(previous, current)
+
+                if new_distance < distance[previous]:
+                    distance[previous] = new_distance
+                    self.next_index[previous] = current
+                    heapq.heappush(heap, (new_distance, previous))
+
+    def relax(self, index, heap):
+        """
+        Picks the best move from the given tile using its neighbours' distances.
+        Adds the tile to the heap if it has a route.
+
+        Args:
+            index (int): The grid index of the tile.
+            heap (list(float, int)): The heap to add the tile to.
+
+        """
+        for neighbour in self.grid.neighbours(index):
+            if self.grid.blocked(neighbour):
+                continue
+
+            new_distance = self.distance[neighbour] + self.get_cost(index, neighbour)
+
+            if new_distance < self.distance[index]:
+                self.distance[index] = new_distance
+                self.next_index[index] = neighbour
+
+        if self.distance[index] < float("inf"):
+            heapq.heappush(heap, (self.distance[index], index))
+
+    def block(self, points):
+        """
+        Updates the field after points have been blocked.
+
+        Args:
+            points (list(int, int)): The points that are now blocked.
+
+        """
+        blocked = set(self.grid.to_index(point) for point in points)
+
+        # Find tiles whose next move is no longer allowed.
+        invalid = set()
+        for tile in blocked:
+            for index in self.grid.around(tile):
+                next_index = self.next_index[index]
+                if next_index in blocked or (next_index != -1 and next_index not in self.grid.neighbours(index)):
+                    invalid.add(index)
+
+        # Any tile routed through those tiles also needs a new route.
+        stack = list(invalid)
+        while len(stack) > 0:
+            current = stack.pop()
+            for previous in self.grid.predecessors(current):
+                if previous not in invalid and self.next_index[previous] == current:
+                    invalid.add(previous)
+                    stack.append(previous)
+
+        for index in invalid:
+            self.distance[index] = float("inf")
+            self.next_index[index] = -1
+
+        # Rebuild routes from the edge of the affected area.
+        heap = []
+        for index in invalid:
+            self.relax(index, heap)
+
+        self.propagate(heap)
+
+    def unblock(self, points):
+        """
+        Updates the field after points have been cleared.
+
+        Args:
+            points (list(int, int)): The points that are now clear.
+
+        """
+        heap = []
+
+        # The cleared tiles and the diagonals around them may give shorter routes.
+        for point in points:
+            cleared = self.grid.to_index(point)
+            for index in [cleared] + self.grid.around(cleared):
+                self.relax(index, heap)
+
+        self.propagate(heap)
+
+
+class OpenSet:
+    """
+    The open set of a search, stored as a binary heap.
+
+    Shared by all of the search algorithms. Lowering the priority of a point
+    pushes a new heap entry, and the old entry is skipped when it is popped
+    (lazy deletion). Membership tests and iteration use the current priorities.
+    """
+
+    def __init__(self):
+        """
+        Constructor.
+        """
+        self.heap = []
+        self.priorities = { }
+        self.counter = itertools.count()
+
+    def __len__(self):
+        return len(self.priorities)
+
+    def __contains__(self, point):
+        return point in self.priorities
+
+    def __iter__(self):
+        return iter(self.priorities)
+
+    def push(self, point, priority):
+        """
+        Adds a point, or changes the priority of a point already in the set.
+
+        Args:
+            point (int): The grid index of the point to add.
+            priority (float): The score used to order the point.
+
+        """
+        self.priorities[point] = priority
+        heapq.heappush(self.heap, (priority, next(self.counter), point))
+
+    def pop(self):
+        """
+        Removes the point with the lowest priority.
+        Ties are broken by the order the points were pushed.
+
+        Returns:
+            (int, float) The grid index of the lowest scoring point and its score.
+
+        """
+        while True:
+            priority, _, point = heapq.heappop(self.heap)
+
+            # Skip entries that were replaced by a later push.
+            if self.priorities.get(point) == priority:
+                del self.priorities[point]
+                return point, priority
+
+    def peek(self):
+        """
+        Finds the point with the lowest priority without removing it.
+
+        Returns:
+            (int, float) The grid index of the lowest scoring point and its score,
+            or (None, None) if the set is empty.
+
+        """
+        while len(self.heap) > 0:
+            priority, _, point = self.heap[0]
+
+            if self.priorities.get(point) == priority:
+                return point, priority
+
+            heapq.heappop(self.heap)
+
+        return None, None
+
+    def discard(self, point):
+        """
+        Removes a point if it is in the set.
+        Its heap entry is skipped when it reaches the top.
+
+        Args:
+            point (int): The grid index of the point to remove.
+
+        """
+        self.priorities.pop(point, None)
+
+    def clear(self):
+        """
+        Removes all points, ready for a new search.
+        """
+        self.heap.clear()
+        self.priorities.clear()
+
+
+class SearchGrid:
+    """
+    The tiles that paths are searched over, stored as flat integer indices.
+
+    Covers the screen plus a one tile border, so the off screen start column
+    on the right and the goal column on the left (x < 0) have indices too.
+    Searches work with indices, and only convert to (x, y) points when a
+    finished path is traced.
+    """
+
+    def __init__(self, resolution, collision):
+        """
+        Constructor.
+
+        Args:
+            resolution (int, int): The screen resolution.
+            collision (Collision): The collision manager instance.
+
+        """
+        self.resolution = resolution
+        self.collision = collision
+        self.res = collision.tile_size
+        self.cols = collision.width + 2
+        self.rows = collision.height + 2
+        self.size = self.cols * self.rows
+
+        # The top left coordinates of each tile.
+        self.xs = array("i", [(i % self.cols - 1) * self.res for i in range(self.size)])
+        self.ys = array("i", [(i // self.cols - 1) * self.res for i in range(self.size)])
+        self.goals = [i for i in range(self.size) if self.is_goal(i)]
+        self.starts = [i for i in range(self.size) if self.is_start(i)]
+
+    def to_index(self, point):
+        """
+        Converts a point to a grid index.
+
+        Args:
+            point (int, int): A point inside the grid.
+
+        Returns:
+            (int): The index of the tile containing the point.
+
+        """
+        return (point[1] // self.res + 1) * self.cols + point[0] // self.res + 1
+
+    def to_point(self, index):
+        """
+        Converts a grid index to a point.
+
+        Args:
+            index (int): The grid index.
+
+        Returns:
+            (int, int): The top left of the tile.
+
+        """
+        return (self.xs[index], self.ys[index])
+
+    def is_goal(self, index):
+        """
+        Returns True if the index is in the goal column, past the left edge.
+        """
+        return self.xs[index] < 0
+
+    def is_start(self, index):
+        """
+        Returns True if the index is in the off screen start column, past the right edge.
+        """
+        return self.xs[index] >= self.resolution[0]
+
+    def blocked(self, index):
+        """
+        Returns True if the tile at the index is blocked.
+        """
+        # The collision grid uses the same layout, so indices can be shared.
+        return self.collision.tiles[index] != 0
+
+    def ring_connected(self, tiles):
+        """
+        Checks if the clear tiles surrounding a rectangle of tiles are connected
+        to each other, without passing through the rectangle.
+
+        Args:
+            tiles (set(int)): The grid indices filling the rectangle.
+
+        Returns:
+            True if there is at most one connected group of clear tiles around the rectangle.
+
+        """
+        cols = [index % self.cols for index in tiles]
+        rows = [index // self.cols for index in tiles]
+        left, right = min(cols) - 1, max(cols) + 1
+        top, bottom = min(rows) - 1, max(rows) + 1
+
+        # Walk clockwise around the rectangle.
+        ring = [(col, top) for col in range(left, right)]
+        ring += [(right, row) for row in range(top, bottom)]
+        ring += [(col, bottom) for col in range(right, left, -1)]
+        ring += [(left, row) for row in range(bottom, top, -1)]
+
+        clear = []
+        for col, row in ring:
+            index = row * self.cols + col
+            inside = 0 <= col < self.cols and 0 <= row < self.rows
+            clear.append(index if inside and not self.blocked(index) else None)
+
+        # Neighbouring clear tiles are linked, except along the start column,
+        # which can only be left by moving onto the screen.
+        total = len([index for index in clear if index is not None])
+        links = 0
+        for i in range(len(clear)):
+            a = clear[i]
+            b = clear[(i + 1) % len(clear)]
+
+            if a is not None and b is not None and not (self.is_start(a) and self.is_start(b)):
+                links += 1
+
+        groups = 1 if links == len(clear) else total - links
+        return groups <= 1
+
+    def reachable(self, blocked_tiles):
+        """
+        Finds the tiles that can reach the goal column, as if some extra tiles were blocked.
+        Moves are treated as horizontal or vertical steps, since diagonals are only
+        allowed when both of those steps are clear.
+
+        Args:
+            blocked_tiles (set(int)): The grid indices to treat as blocked.
+
+        Returns:
+            (set(int)): The grid indices that can reach the goal.
+
+        """
+        reached = set(self.goals)
+        stack = list(self.goals)
+
+        while len(stack) > 0:
+            current = stack.pop()
+            col = current % self.cols
+            row = current // self.cols
+
+            options = []
+            if col > 0:
+                options.append(current - 1)
+            if col < self.cols - 1:
+                options.append(current + 1)
+
+            # The start column cannot be moved along.
+            if not self.is_start(current):
+                if row > 0:
+                    options.append(current - self.cols)
+                if row < self.rows - 1:
+                    options.append(current + self.cols)
+
+            for previous in options:
+                if previous not in reached and previous not in blocked_tiles and not self.blocked(previous):
+                    reached.add(previous)
+                    stack.append(previous)
+
+        return reached
+
+    def around(self, index):
+        """
+        Finds the tiles surrounding the given tile, including diagonals.
+
+        Args:
+            index (int): The grid index of the centre tile.
+
+        Returns:
+            (list(int)): The grid indices of the surrounding tiles.
+
+        """
+        col = index % self.cols
+        row = index // self.cols
+
+        return [index + y * self.cols + x for y in (-1, 0, 1) for x in (-1, 0, 1)
+                if (x != 0 or y != 0) and 0 <= col + x < self.cols and 0 <= row + y < self.rows]
+
+    def predecessors(self, index):
+        """
+        Finds the tiles that can move onto the given tile.
+        The reverse of neighbours(), used to search back from the goal.
+
+        Args:
+            index (int): The grid index of the destination tile.
+
+        Returns:
+            (list(int)): The grid indices of the tiles leading to it.
+
+        """
+        if self.blocked(index):
+            return []
+
+        cols = self.cols
+        col = index % cols
+        row = index // cols
+        blocked = self.blocked
+        on_screen = lambda i: self.xs[i] < self.resolution[0]
+
+        west = col > 0
+        east = col < cols - 1
+        north = row > 0
+        south = row < self.rows - 1
+
+        # The off screen start column can only move left, onto the screen.
+        result = []
+
+        if west:
+            result.append(index - 1)
+        if east:
+            result.append(index + 1)
+        if north and on_screen(index - cols):
+            result.append(index - cols)
+        if south and on_screen(index + cols):
+            result.append(index + cols)
+
+        west_clear = west and not blocked(index - 1)
+        east_clear = east and not blocked(index + 1)
+        north_clear = north and not blocked(index - cols)
+        south_clear = south and not blocked(index + cols)
+
+        if north_clear and west_clear:
+            result.append(index - cols - 1)
+        if south_clear and west_clear:
+            result.append(index + cols - 1)
+        if north_clear and east_clear and on_screen(index - cols + 1):
+            result.append(index - cols + 1)
+        if south_clear and east_clear and on_screen(index + cols + 1):
+            result.append(index + cols + 1)
+
+        return result
+
+    def neighbours(self, index):
+        """
+        Finds the tiles that can be moved to from the given tile.
+        Diagonals are only allowed if both adjacent tiles are clear.
+
+        Args:
+            index (int): The grid index of the start tile.
+
+        Returns:
+            (list(int)): The grid indices of the neighbours.
+
+        """
+        # The off screen start column can only move onto the screen.
+        if self.xs[index] >= self.resolution[0]:
+            return [index - 1]
+
+        cols = self.cols
+        col = index % cols
+        row = index // cols
+        blocked = self.blocked
+
+        west = col > 0 and not blocked(index - 1)
+        east = col < cols - 1 and not blocked(index + 1)
+        north = row > 0 and not blocked(index - cols)
+        south = row < self.rows - 1 and not blocked(index + cols)
+
+        result = []
+
+        if west:
+            if north and not blocked(index - cols - 1):
+                result.append(index - cols - 1)
+            result.append(index - 1)
+            if south and not blocked(index + cols - 1):
+                result.append(index + cols - 1)
+
+        if north:
+            result.append(index - cols)
+        if south:
+            result.append(index + cols)
+
+        if east:
+            if north and not blocked(index - cols + 1):
+                result.append(index - cols + 1)
+            result.append(index + 1)
+            if south and not blocked(index + cols + 1):
+                result.append(index + cols + 1)
+
+        return result
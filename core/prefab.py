@@ -17,6 +17,7 @@
 
 from pygame.sprite import Sprite
 from pygame.rect import Rect
+import os
 import pygame
 
 
@@ -29,6 +30,17 @@ class Prefab(Sprite):
     # Used to cache config files { name, config }
     Cache = { }
 
+    # True to skip converting images to the display's format, when there is no display.
+    Headless = False
+
+    # Killed instances waiting to be reused, or None if the type is not pooled.
+    # Pooled types set this to their own list, and define reset() taking the
+    # same arguments as their constructor.
+    Pool = None
+
+    # The most killed instances kept in each pool.
+    PoolSize = 256
+
     def __init__(self, name, x, y):
         """ 
         Constructor. 
@@ -44,7 +56,48 @@ class Prefab(Sprite):
         self.name = name
         self.config = self.load_config(name)
         self.apply_config(self.config)
+        self.place(x, y)
+
+    @classmethod
+    def create(cls, *args):
+        """
+        Creates an instance, reusing a killed one if the type is pooled.
+
+        Args:
+            *args: The constructor arguments.
+
+        Returns:
+            (Prefab): The new or reused instance.
+
+        """
+        if cls.Pool:
+            instance = cls.Pool.pop()
+            instance.reset(*args)
+            return instance
+
+        return cls(*args)
 
+    @classmethod
+    def clear_pools(cls):
+        """
+        Empties the pools of this type and every type derived from it.
+        Called when a level is loaded, or the game is over.
+        """
+        if "Pool" in cls.__dict__ and cls.Pool is not None:
+            cls.Pool.clear()
+
+        for subclass in cls.__subclasses__():
+            subclass.clear_pools()
+
+    def place(self, x, y):
+        """
+        Moves the prefab and restarts any animation, as when first created.
+
+        Args:
+            x (int): The top left x coordinate.
+            y (int): The top left y coordinate.
+
+        """
         # Handle animations
         if hasattr(self, "anim_source"):
             self.anim_change_time = self.anim_rate
@@ -59,6 +112,29 @@ class Prefab(Sprite):
         else:
             self.rect = Rect(x, y, 32, 32)
 
+    def get_rotated_image(self, angle):
+        """
+        Picks the precomputed rotation (from a rotimg variable) nearest an angle.
+
+        Args:
+            angle (float): The angle (degrees) to rotate anticlockwise by.
+
+        Returns:
+            (pygame.Surface): The rotated image, shared with other instances.
+
+        """
+        return self.images[round(angle / 5) % 72]
+
+    def kill(self):
+        """
+        Removes the prefab from all groups, keeping it for reuse if the type is pooled.
+        """
+        pooled = self.Pool is not None and self.alive()
+        super().kill()
+
+        if pooled and len(self.Pool) < self.PoolSize:
+            self.Pool.append(self)
+
     def update_animation(self, delta):
         """
         Updates any spritesheet animation on the prefab.
@@ -101,7 +177,7 @@ class Prefab(Sprite):
         entries = { }
 
         try:
-            with open("prefabs\\" + name + ".prefab", "r") as file:
+            with open(os.path.join("prefabs", name + ".prefab"), "r") as file:
                 for line in [f.split(":") for f in file.readlines() if f[0] != "#" and len(f.strip()) != 0]:
                     key = line[0].strip()
                     type = line[1].strip()
@@ -116,15 +192,15 @@ class Prefab(Sprite):
                     elif type == "bool":
                         entries[key] = (value == "1")
                     elif type == "img":
-                        entries[key] = pygame.image.load(value).convert()
+                        entries[key] = self.load_image(value, False)
                     elif type == "aimg":
-                        entries[key] = pygame.image.load(value).convert_alpha()
+                        entries[key] = self.load_image(value, True)
                     elif type == "font":
                         entries[key] = pygame.font.Font(pygame.font.match_font(value, "font_bold" in entries.keys()), entries["font_size"])
                     elif type == "spritesheet":
-                        entries[key] = [pygame.image.load(value + str(i) + ".png").convert_alpha() for i in range(entries["anim_count"])]
+                        entries[key] = [self.load_image(value + str(i) + ".png", True) for i in range(entries["anim_count"])]
                     elif type == "rotimg":
-                        original = pygame.image.load(value).convert_alpha()
+                        original = self.load_image(value, True)
                         entries[key] = [original] + [pygame.transform.rotate(original, angle) for angle in range(5, 361, 5)]
 
         except OSError:
@@ -133,6 +209,27 @@ class Prefab(Sprite):
         Prefab.Cache[name] = entries
         return entries
 
+    def load_image(self, file, alpha):
+        """
+        Loads an image, converting it to the display's format unless headless.
+
+        Args:
+            file (str): The image file to load, with folders separated by backslashes as in .prefab files.
+            alpha (bool): True to keep the image's transparency.
+
+        Returns:
+            (Surface): The loaded image.
+
+        """
+        image = pygame.image.load(os.path.join(*file.split("\\")))
+
+        if Prefab.Headless:
+            return image
+        elif alpha:
+            return image.convert_alpha()
+        else:
+            return image.convert()
+
     def apply_config(self, config):
         """ 
         Applies all config settings to the prefab instance.
@@ -0,0 +1,159 @@
+
+
+###########################################
+#
+# COMP 1551
+# Core Programming
+#
+# Coursework 2 - Mini Project
+#
+# George Loines
+# 200836065
+#
+# 02 Feb 2015
+#
+###########################################
+
+
+import pygame
+
+
+class Renderer:
+    """
+    Draws each frame to the window, only updating the parts that changed.
+
+    Sprites are drawn over a background surface. Each frame, the sprites
+    are compared with how they were last drawn. Only sprites that moved,
+    changed image, appeared or disappeared leave changed areas. The
+    background is restored under those areas, any sprites over them are
+    drawn again, and only those areas are sent to the display.
+
+    Full frames redraw and send the whole window instead. They are used
+    when something is drawn outside the sprites, such as the menu screens
+    or debug overlays. The frame after a full frame is also full, to
+    remove anything that frame drew.
+    """
+
+    def __init__(self, window):
+        """
+        Constructor.
+
+        Args:
+            window (Window): The window to draw to.
+
+        """
+        self.window = window
+        self.background = window.background
+        self.changed = []
+        self.sprites = []
+        self.drawn = { }
+        self.full = True
+        self.redraw = True
+
+    def set_background(self, surface):
+        """
+        Sets the surface that sprites are drawn over, and redraws it all next frame.
+
+        Args:
+            surface (Surface): The background, the size of the window.
+
+        """
+        self.background = surface
+        self.redraw = True
+
+    def invalidate(self, rect):
+        """
+        Marks an area of the background as changed, so it is redrawn next frame.
+
+        Args:
+            rect (Rect): The area that changed.
+
+        """
+        self.changed.append(pygame.Rect(rect))
+
+    def begin(self, full=False):
+        """
+        Starts a frame.
+
+        Args:
+            full (bool): True to redraw the whole window this frame.
+
+        """
+        self.full = full or self.redraw
+        self.redraw = full
+        self.sprites = []
+
+        if self.full:
+            self.window.screen.blit(self.background, (0, 0))
+
+    def draw(self, group):
+        """
+        Adds a group of sprites to the frame, over the groups already added.
+        Full frames draw them straight away, so anything drawn later is on top.
+
+        Args:
+            group (Group): The sprites to draw.
+
+        """
+        sprites = group.sprites()
+        self.sprites.extend(sprites)
+
+        if self.full:
+            self.window.screen.blits([(sprite.image, sprite.rect) for sprite in sprites], doreturn=False)
+
+    def end(self):
+        """
+        Finishes a frame, sending the changed areas to the display.
+        """
+        if self.full:
+            pygame.display.flip()
+        else:
+            self.draw_changed()
+
+        self.drawn = {sprite: (sprite.image, sprite.rect.copy()) for sprite in self.sprites}
+        self.changed = []
+
+    def draw_changed(self):
+        """
+        Redraws the areas changed since the last frame, and sends them to the display.
+        """
+        changed = self.changed
+        drawn = self.drawn
+
+        for sprite in self.sprites:
+            last = drawn.pop(sprite, None)
+
+            if last is None:
+                changed.append(sprite.rect.copy())
+            elif last[0] is not sprite.image or last[1] != sprite.rect:
+                if last[1].colliderect(sprite.rect):
+                    changed.append(last[1].union(sprite.rect))
+                else:
+                    changed.append(last[1])
+                    changed.append(sprite.rect.copy())
+
+        # Sprites left over were drawn last frame, but not this one.
+        changed.extend(rect for image, rect in drawn.values())
+
+        if len(changed) == 0:
+            return
+
+        # Each area is restored, then the sprites over it are drawn again, only
+        # inside the area. Sprites over the rest of the window, or other areas,
+        # are left alone, so nothing is drawn twice or out of order.
+        screen = self.window.screen
+        background = self.background
+        sprites = self.sprites
+        rects = [sprite.rect for sprite in sprites]
+        blits = []
+
+        for area in changed:
+            blits.append((background, area, area))
+
+            for index in area.collidelistall(rects):
+                rect = rects[index]
+                clip = rect.clip(area)
+                blits.append((sprites[index].image, clip, clip.move(-rect.x, -rect.y)))
+
+        screen.blits(blits, doreturn=False)
+        pygame.display.update(changed)
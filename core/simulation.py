@@ -0,0 +1,176 @@
+
+
+###########################################
+#
+# COMP 1551
+# Core Programming
+#
+# Coursework 2 - Mini Project
+#
+# George Loines
+# 200836065
+#
+# 02 Feb 2015
+#
+###########################################
+
+
+import sys
+import pygame
+from core.game import Game
+from core.prefab import Prefab
+
+
+class HeadlessWindow:
+    """
+    Stands in for the Window when there is no display.
+    Nothing is ever drawn to it.
+    """
+
+    def __init__(self, width, height):
+        """
+        Constructor.
+
+        Args:
+            width (int): The level width, in pixels.
+            height (int): The level height, in pixels.
+
+        """
+        self.resolution = (width, height)
+        self.background = pygame.Surface(self.resolution)
+        self.screen = None
+
+
+class Simulation(Game):
+    """
+    Runs the game without a window, menu or drawing, with a fixed time step,
+    as fast as possible. Used for balancing and pathfinding benchmarks.
+
+    Defences are placed by a script of (time, name, (x, y)) entries, using
+    the level time and the defence prefab names, as in tower_log.csv.
+
+    Simulations are deterministic unless told otherwise, so the same seed,
+    level and placements always give the same results.
+
+    Images are not converted for display once a simulation has been created,
+    so it should not share a process with a windowed game.
+    """
+
+    def __init__(self, level="basic", timestep=1 / 60.0, placements=None, **settings):
+        """
+        Constructor.
+
+        Args:
+            level (str): The name of the level to play.
+            timestep (float): The time (seconds) simulated by each update.
+            placements (list((float, str, (int, int)))): The defences to place, and when.
+            **settings: Values to use instead of the default Game settings, e.g. seed.
+
+        """
+        settings.setdefault("deterministic", True)
+        pygame.font.init()
+        Prefab.Headless = True
+
+        self.timestep = timestep
+        self.placements = sorted(placements or [], key=lambda placement: placement[0])
+        self.placed = 0
+        self.lost = False
+
+        super().__init__(HeadlessWindow(1280, 768), level, **settings)
+
+    def load_level(self, name):
+        """
+        Loads a new level, and starts it straight away.
+
+        Args:
+            name (str): The name of the level (case sensitive).
+
+        """
+        super().load_level(name)
+
+        # The menu is never shown or updated without a display.
+        self.menu.visible = False
+
+    def update(self, delta):
+        """
+        Places any defences that are due, then updates the level.
+
+        Args:
+            delta (float): The time (seconds) since the last update.
+
+        """
+        while self.placed < len(self.placements) and self.placements[self.placed][0] <= self.level.time:
+            _, name, position = self.placements[self.placed]
+            self.placed += 1
+
+            names = [defence.name for defence in self.defence_prototypes]
+            if name not in names:
+                print("Could not place unknown defence " + name)
+                continue
+
+            # Defences must fit inside the window, once moved onto the tile grid.
+            prototype = self.defence_prototypes[names.index(name)]
+            rect = pygame.Rect(position[0] - position[0] % 32, position[1] - position[1] % 32, prototype.rect.width, prototype.rect.height)
+            if not pygame.Rect((0, 0), self.window.resolution).contains(rect):
+                print("Could not place defence " + name + " off screen at " + str(position))
+                continue
+
+            self.select_defence(names.index(name))
+            self.place_defence(position)
+
+        self.update_level(delta)
+
+    def game_over(self):
+        """
+        Called when the last life is lost. Ends the simulation.
+        """
+        Prefab.clear_pools()
+        self.lost = True
+
+    def run(self, waves=None, time=None):
+        """
+        Runs the simulation until the game is lost, or a limit is reached.
+
+        Args:
+            waves (int): Stop once this many waves have been finished, if given.
+            time (float): Stop once this much level time (seconds) has passed, if given.
+
+        Returns:
+            (dict): The results, from get_results().
+
+        """
+        while not self.lost:
+            if waves is not None and self.wave.number > waves:
+                break
+            if time is not None and self.level.time >= time:
+                break
+
+            self.update(self.timestep)
+
+        return self.get_results()
+
+    def get_results(self):
+        """
+        Gets the current state of the game.
+
+        Returns:
+            (dict): The level, wave, lives, money, score and level time.
+
+        """
+        return {
+            "level": self.level.name,
+            "wave": self.wave.number,
+            "lives": self.level.lives,
+            "money": self.level.money,
+            "score": self.level.get_score(),
+            "time": self.level.time
+        }
+
+
+if __name__ == "__main__":
+    # e.g. python -m core.simulation maze 20 1
+    level = sys.argv[1] if len(sys.argv) > 1 else "basic"
+    waves = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else None
+
+    print(Simulation(level, seed=seed).run(waves=waves))
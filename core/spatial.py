@@ -0,0 +1,155 @@
+
+
+###########################################
+#
+# COMP 1551
+# Core Programming
+#
+# Coursework 2 - Mini Project
+#
+# George Loines
+# 200836065
+#
+# 02 Feb 2015
+#
+###########################################
+
+
+class SpatialGrid:
+    """
+    Buckets sprites by the grid cell containing their centre, so the
+    sprites near a point can be found without checking every sprite.
+
+    Rebuilt once per frame, after the sprites have moved, and added to as
+    new sprites appear. Queries skip sprites that have been killed since,
+    and return sprites in the order they were added.
+    """
+
+    def __init__(self, cell_size):
+        """
+        Constructor.
+
+        Args:
+            cell_size (int): The size (pixels) of each cell.
+
+        """
+        self.cell_size = cell_size
+        self.cells = { }
+        self.count = 0
+        self.max_radius = 0
+
+    def rebuild(self, sprites):
+        """
+        Replaces the contents of the grid.
+
+        Args:
+            sprites (iterable(Sprite)): The sprites to add.
+
+        """
+        self.cells = { }
+        self.count = 0
+        self.max_radius = 0
+
+        for sprite in sprites:
+            self.add(sprite)
+
+    def add(self, sprite):
+        """
+        Adds a sprite at its current position.
+
+        Args:
+            sprite (Sprite): The sprite to add.
+
+        """
+        x, y = sprite.rect.center
+        self.cells.setdefault((x // self.cell_size, y // self.cell_size), []).append((self.count, sprite))
+        self.count += 1
+        self.max_radius = max(self.max_radius, sprite.rect.width / 2)
+
+    def nearby(self, point, radius):
+        """
+        Finds the sprites in the cells touching a square around a point.
+
+        Args:
+            point (int, int): The centre of the square.
+            radius (float): Half the width of the square.
+
+        Returns:
+            (list(int, Sprite)): The add order and sprite of each live sprite found.
+
+        """
+        if self.count == 0:
+            return []
+
+        size = self.cell_size
+        min_x = int((point[0] - radius) // size)
+        max_x = int((point[0] + radius) // size)
+        min_y = int((point[1] - radius) // size)
+        max_y = int((point[1] + radius) // size)
+        found = []
+
+        # Large squares cover more cells than are occupied, so check the occupied cells instead.
+        if (max_x - min_x + 1) * (max_y - min_y + 1) > len(self.cells):
+            for (cell_x, cell_y), cell in self.cells.items():
+                if min_x <= cell_x <= max_x and min_y <= cell_y <= max_y:
+                    found.extend(entry for entry in cell if entry[1].alive())
+
+            return found
+
+        for cell_x in range(min_x, max_x + 1):
+            for cell_y in range(min_y, max_y + 1):
+                cell = self.cells.get((cell_x, cell_y))
+
+                if cell is not None:
+                    found.extend(entry for entry in cell if entry[1].alive())
+
+        return found
+
+    def query_radius(self, point, radius):
+        """
+        Finds the sprites with centres within a radius of a point.
+
+        Args:
+            point (int, int): The centre of the circle.
+            radius (float): The radius of the circle.
+
+        Returns:
+            (list(Sprite)): The sprites found, in the order they were added.
+
+        """
+        max_magnitude = radius ** 2
+        found = []
+
+        for order, sprite in self.nearby(point, radius):
+            dx = sprite.rect.centerx - point[0]
+            dy = sprite.rect.centery - point[1]
+
+            if (dx ** 2) + (dy ** 2) <= max_magnitude:
+                found.append((order, sprite))
+
+        found.sort(key=lambda entry: entry[0])
+        return [sprite for order, sprite in found]
+
+    def query_point(self, point):
+        """
+        Finds the sprites covering a point, treating each sprite as a circle
+        as wide as its rect.
+
+        Args:
+            point (int, int): The point to check.
+
+        Returns:
+            (list(Sprite)): The sprites found, in the order they were added.
+
+        """
+        found = []
+
+        for order, sprite in self.nearby(point, self.max_radius):
+            dx = sprite.rect.centerx - point[0]
+            dy = sprite.rect.centery - point[1]
+
+            if (dx ** 2) + (dy ** 2) < (sprite.rect.width / 2) ** 2:
+                found.append((order, sprite))
+
+        found.sort(key=lambda entry: entry[0])
+        return [sprite for order, sprite in found]
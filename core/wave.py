@@ -18,6 +18,12 @@
 import pygame
 import random
 from core.enemy import Enemy
+from core.spatial import SpatialGrid
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 
 class Wave:
@@ -39,6 +45,11 @@ class Wave:
         self.started = False
         self.done = False
         self.enemies = pygame.sprite.Group()
+        self.grid = None
+        self.manager = None
+
+        if getattr(game, "enemy_simulation", "sprites") == "arrays" and numpy is not None:
+            self.manager = EnemyManager()
         self.spawn_time = 0
         self.spawn_gap = 3 - (number ** 0.6)
         self.spawn_count_small = int(number ** 2.5)
@@ -48,13 +59,18 @@ class Wave:
     def update(self, delta):
         """
         Called once per frame.
-        Updates enemy spawning.
+        Updates enemies, the spatial grid and enemy spawning.
 
         Args:
             delta (float): The time (seconds) since the last update.
 
         """
-        self.enemies.update(delta)
+        if self.manager is not None:
+            self.manager.update(delta)
+        else:
+            self.enemies.update(delta)
+
+        self.get_grid().rebuild(self.enemies)
 
         self.spawn_time -= delta
         if self.spawn_time > 0:
@@ -87,6 +103,25 @@ class Wave:
         """
         enemy = Enemy(self.game, enemy_type, 0, 0)
         self.enemies.add(enemy)
+        self.get_grid().add(enemy)
+
+        if self.manager is not None:
+            self.manager.add(enemy)
+
+    def get_grid(self):
+        """
+        Gets the spatial grid of enemies, creating it the first time it is used.
+        Used to find the enemies near a point.
+
+        Returns:
+            (SpatialGrid): The grid, bucketed by the level's collision tiles.
+
+        """
+        if self.grid is None:
+            self.grid = SpatialGrid(self.game.level.collision.tile_size)
+            self.grid.rebuild(self.enemies)
+
+        return self.grid
 
     def enemy_killed(self):
         """
@@ -94,3 +129,164 @@ class Wave:
         """
         if len(self.enemies) == 0 and self.spawn_count_small <= 0 and self.spawn_count_medium <= 0:
             self.done = True
+
+
+class EnemyManager:
+    """
+    Moves all of a wave's enemies together, using numpy arrays.
+
+    Each enemy has a slot in the arrays, holding its position, target,
+    speed and spawn order. Every frame, all enemies step towards their targets at once.
+    Only enemies that reach their target run Python code, to pick their
+    next target. The enemy sprites are still used for drawing, collisions
+    and damage, and their rects are kept up to date. Their exact positions
+    are set when they reach a target, or stop being moved.
+    """
+
+    def __init__(self, capacity=64):
+        """
+        Constructor.
+
+        Args:
+            capacity (int): The number of enemy slots to start with.
+
+        """
+        self.enemies = [None] * capacity
+        self.free = []
+        self.count = 0
+        self.spawned = 0
+
+        # The exact position, the rect position and the target of each enemy.
+        self.x = numpy.zeros(capacity)
+        self.y = numpy.zeros(capacity)
+        self.left = numpy.zeros(capacity)
+        self.top = numpy.zeros(capacity)
+        self.target_x = numpy.zeros(capacity)
+        self.target_y = numpy.zeros(capacity)
+        self.speed = numpy.zeros(capacity)
+        self.order = numpy.zeros(capacity, dtype=numpy.int64)
+        self.active = numpy.zeros(capacity, dtype=bool)
+
+    def grow(self):
+        """
+        Doubles the number of enemy slots.
+        """
+        capacity = len(self.enemies)
+        self.enemies.extend([None] * capacity)
+
+        for name in ["x", "y", "left", "top", "target_x", "target_y", "speed", "order", "active"]:
+            values = getattr(self, name)
+            setattr(self, name, numpy.concatenate((values, numpy.zeros(capacity, dtype=values.dtype))))
+
+    def add(self, enemy):
+        """
+        Starts moving an enemy with the others.
+
+        Args:
+            enemy (Enemy): The newly spawned enemy.
+
+        """
+        if len(self.free) > 0:
+            slot = self.free.pop()
+        else:
+            if self.count == len(self.enemies):
+                self.grow()
+            slot = self.count
+            self.count += 1
+
+        self.enemies[slot] = enemy
+        self.x[slot] = enemy.x
+        self.y[slot] = enemy.y
+        self.left[slot] = enemy.rect.x
+        self.top[slot] = enemy.rect.y
+        self.target_x[slot] = enemy.target[0]
+        self.target_y[slot] = enemy.target[1]
+        self.speed[slot] = enemy.speed
+        self.order[slot] = self.spawned
+        self.active[slot] = True
+        self.spawned += 1
+
+        enemy.manager = self
+        enemy.slot = slot
+
+    def remove(self, enemy):
+        """
+        Stops moving an enemy, freeing its slot.
+
+        Args:
+            enemy (Enemy): The enemy, which has died or escaped.
+
+        """
+        slot = enemy.slot
+        if self.enemies[slot] is not enemy:
+            return
+
+        enemy.x = float(self.x[slot])
+        enemy.y = float(self.y[slot])
+        self.enemies[slot] = None
+        self.active[slot] = False
+        self.free.append(slot)
+        enemy.manager = None
+
+    def update(self, delta):
+        """
+        Moves every enemy towards its target, following Enemy.update_position().
+
+        Args:
+            delta (float): The time (seconds) since the last update.
+
+        """
+        count = self.count
+        if count == 0:
+            return
+
+        x = self.x[:count]
+        y = self.y[:count]
+        left = self.left[:count]
+        top = self.top[:count]
+        active = self.active[:count]
+
+        # Steps are measured from the rect, as for a single enemy.
+        dx = self.target_x[:count] - left
+        dy = self.target_y[:count] - top
+        distance = numpy.sqrt(dx ** 2 + dy ** 2)
+        step = self.speed[:count] * delta
+
+        arrived = active & (distance < step)
+        moving = active & ~arrived
+
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            proportion = step / distance
+
+        x[moving] += dx[moving] * proportion[moving]
+        y[moving] += dy[moving] * proportion[moving]
+
+        # Rects round half away from zero. Only rects that changed are copied to the sprites.
+        new_left = numpy.copysign(numpy.floor(numpy.abs(x) + 0.5), x)
+        new_top = numpy.copysign(numpy.floor(numpy.abs(y) + 0.5), y)
+        changed = numpy.flatnonzero(moving & ((new_left != left) | (new_top != top)))
+        left[changed] = new_left[changed]
+        top[changed] = new_top[changed]
+
+        enemies = self.enemies
+        for slot, rect_x, rect_y in zip(changed.tolist(), left[changed].astype(int).tolist(), top[changed].astype(int).tolist()):
+            enemies[slot].rect.topleft = (rect_x, rect_y)
+
+        # Enemies at their target pick the next one, in the order they spawned,
+        # which may kill them.
+        arrived = numpy.flatnonzero(arrived)
+        arrived = arrived[numpy.argsort(self.order[arrived], kind="stable")]
+
+        for slot in arrived.tolist():
+            enemy = self.enemies[slot]
+            target = enemy.target
+            enemy.x, enemy.y = target
+            x[slot] = left[slot] = target[0]
+            y[slot] = top[slot] = target[1]
+
+            enemy.reached_target()
+            enemy.rect.topleft = target
+
+            if enemy.manager is self:
+                self.target_x[slot] = enemy.target[0]
+                self.target_y[slot] = enemy.target[1]
@@ -59,10 +59,3 @@ class Window:
         self.background = pygame.Surface(self.resolution)
         self.background.fill(pygame.Color(r, g, b))
         self.background = self.background.convert()
-
-    def clear(self):
-        """ 
-        Clears the window, using the background colour.
-        """
-        pygame.display.flip()
-        self.screen.blit(self.background, (0, 0))
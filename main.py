@@ -19,17 +19,18 @@ import pygame
 from core.game import Game
 from core.window import Window
 
-# Init pygame
-pygame.init()
+if __name__ == "__main__":
+    # Init pygame
+    pygame.init()
 
-# Create a window
-window = Window(1280, 768)
-window.set_title("Tower Defence")
-window.set_background(148, 168, 176)
+    # Create a window
+    window = Window(1280, 768)
+    window.set_title("Tower Defence")
+    window.set_background(148, 168, 176)
 
-# Create the game instance
-game = Game(window)
-game.run()
+    # Create the game instance
+    game = Game(window)
+    game.run()
 
-# Quit pygame
-pygame.quit()
+    # Quit pygame
+    pygame.quit()
@@ -0,0 +1,60 @@
+
+
+###########################################
+#
+# COMP 1551
+# Core Programming
+#
+# Coursework 2 - Mini Project
+#
+# Smoke tests for the headless simulation.
+#
+###########################################
+
+
+import os
+from core.simulation import Simulation
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_short_simulation(monkeypatch):
+    """
+    Loads a level with its prefabs and images, and plays a few seconds of it.
+    """
+    monkeypatch.chdir(ROOT)
+
+    results = Simulation("basic", seed=1).run(time=5)
+
+    assert results["level"] == "basic"
+    assert results["time"] >= 5
+    assert results["lives"] > 0
+
+
+def test_simulation_is_deterministic(monkeypatch):
+    """
+    Runs the same seeded simulation twice, placing a defence, and compares the results.
+    """
+    monkeypatch.chdir(ROOT)
+    placements = [(1.0, "defence_pillbox", (320, 320))]
+
+    first = Simulation("basic", placements=placements, seed=1).run(time=10)
+    second = Simulation("basic", placements=placements, seed=1).run(time=10)
+
+    assert first == second
+
+
+def test_off_screen_placements_are_rejected(monkeypatch):
+    """
+    Places defences outside the window, which should be skipped without costing money.
+    """
+    monkeypatch.chdir(ROOT)
+    placements = [(0.0, "defence_wall", position) for position in [(100, 800), (1300, 100), (-40, 100), (1270, 100)]]
+
+    simulation = Simulation("basic", placements=placements, seed=1)
+    money = simulation.level.money
+    results = simulation.run(time=1)
+
+    assert simulation.placed == len(placements)
+    assert results["money"] >= money